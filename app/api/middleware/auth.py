@@ -2,75 +2,117 @@
 Authentication middleware for API security.
 """
 
-from fastapi import Request, Response
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from config.settings import get_settings
+import hmac
+import orjson
 import logging
 import time
 
 logger = logging.getLogger(__name__)
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Authentication middleware for bearer token validation."""
+# Pre-serialized 401 bodies so the deny path never builds a Response object
+_MISSING_HEADER_BODY = orjson.dumps({"detail": "Authorization header required"})
+_INVALID_SCHEME_BODY = orjson.dumps({"detail": "Invalid authentication scheme"})
+_INVALID_FORMAT_BODY = orjson.dumps({"detail": "Invalid authorization header format"})
+_INVALID_TOKEN_BODY = orjson.dumps({"detail": "Invalid authentication token"})
+
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+]
+
+class AuthMiddleware:
+    """Authentication middleware for bearer token validation (pure ASGI)."""
     
-    def __init__(self, app):
-        super().__init__(app)
-        self.settings = get_settings()
-        self.exempt_paths = {"/health", "/health/ready", "/health/alive", "/docs", "/redoc", "/openapi.json"}
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        settings = get_settings()
+        self.exempt_paths = frozenset({"/health", "/health/ready", "/health/alive", "/docs", "/redoc", "/openapi.json"})
+        # Only the values needed per request are kept, already in their hot-path form
+        self.expected_token = settings.BEARER_TOKEN.encode()
+        # X-Process-Time is only emitted in debug mode
+        self.debug = settings.DEBUG
     
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request through authentication middleware."""
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter_ns() if self.debug else 0
+        path = scope["path"]
         
         # Skip authentication for exempt paths
-        if request.url.path in self.exempt_paths:
-            response = await call_next(request)
-            return response
+        if path in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        # CORS preflight requests never carry credentials
+        if scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
         
         # Check for authorization header
-        auth_header = request.headers.get("authorization")
+        auth_header = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth_header = value
+                break
+        
         if not auth_header:
-            logger.warning(f"Missing authorization header for {request.url.path}")
-            return JSONResponse(
-                status_code=401,
-                content={"detail": "Authorization header required"}
-            )
+            logger.warning("Missing authorization header for %s", path)
+            await self._reject(send, _MISSING_HEADER_BODY)
+            return
         
         # Validate bearer token format
-        try:
-            scheme, token = auth_header.split()
-            if scheme.lower() != "bearer":
-                logger.warning(f"Invalid auth scheme: {scheme}")
-                return JSONResponse(
-                    status_code=401,
-                    content={"detail": "Invalid authentication scheme"}
-                )
-        except ValueError:
+        parts = auth_header.split()
+        if len(parts) != 2:
             logger.warning("Invalid authorization header format")
-            return JSONResponse(
-                status_code=401,
-                content={"detail": "Invalid authorization header format"}
-            )
+            await self._reject(send, _INVALID_FORMAT_BODY)
+            return
         
-        # Validate token
-        if token != self.settings.BEARER_TOKEN:
-            logger.warning(f"Invalid token attempt from {request.client.host}")
-            return JSONResponse(
-                status_code=401,
-                content={"detail": "Invalid authentication token"}
-            )
+        scheme, token = parts
+        if scheme.lower() != b"bearer":
+            logger.warning("Invalid auth scheme: %r", scheme)
+            await self._reject(send, _INVALID_SCHEME_BODY)
+            return
         
-        # Process request
-        response = await call_next(request)
+        # Validate token
+        if not hmac.compare_digest(token, self.expected_token):
+            logger.warning("Invalid token attempt from %s", scope.get("client"))
+            await self._reject(send, _INVALID_TOKEN_BODY)
+            return
         
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
+        # Expose the verified principal to downstream handlers via request.state
+        scope.setdefault("state", {})["auth_token"] = token.decode("latin-1")
         
-        # Log request processing time
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add security headers in a single splice
+                headers = [*message.get("headers", ()), *SECURITY_HEADERS]
+                
+                # Report processing time in milliseconds when debugging
+                if self.debug:
+                    process_ms = (time.perf_counter_ns() - start_time) // 1_000_000
+                    headers.append((b"x-process-time", b"%d" % process_ms))
+                message["headers"] = headers
+            await send(message)
         
-        return response
+        # Process request
+        await self.app(scope, receive, send_wrapper)
+    
+    @staticmethod
+    async def _reject(send: Send, body: bytes) -> None:
+        """Send a pre-serialized 401 response."""
+        await send({
+            "type": "http.response.start",
+            "status": 401,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"www-authenticate", b"Bearer"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -10,7 +10,13 @@ import logging
 logger = logging.getLogger(__name__)
 
 def setup_cors(app: FastAPI) -> None:
-    """Setup CORS middleware with appropriate configuration."""
+    """
+    Setup CORS middleware with appropriate configuration.
+    
+    Starlette runs the most recently added middleware first, so call this
+    after adding auth and rate limiting: preflight requests are then answered
+    by CORS before they can be rate-limited or rejected for missing auth.
+    """
     settings = get_settings()
     
     # Configure CORS origins based on environment
@@ -2,112 +2,243 @@
 Rate limiting middleware to prevent abuse.
 """
 
-from fastapi import Request, Response
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from collections import defaultdict, deque
-from typing import Dict, Deque
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from collections import OrderedDict
+from typing import List, Optional, Protocol, Tuple
+import orjson
+import threading
 import time
 import logging
 import asyncio
+import uuid
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None
 
 logger = logging.getLogger(__name__)
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware using sliding window algorithm."""
+# Pre-serialized 429 body and headers. Outer middleware (e.g. CORS) edits
+# response messages in place, so each denial still sends fresh messages.
+_RL_429_BODY = orjson.dumps({
+    "detail": "Rate limit exceeded. Please try again later.",
+    "retry_after": 60
+})
+_RL_429_HEADERS = (
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_RL_429_BODY)).encode()),
+    (b"retry-after", b"60"),
+)
+
+class SlidingWindowBackend(Protocol):
+    """Storage backend for rate limit bookkeeping."""
+    
+    async def hit(self, client_ip: str, now: int) -> Tuple[bool, int]:
+        """
+        Record a request for a client.
+        
+        Args:
+            client_ip: Client identifier
+            now: Current time in integer monotonic seconds
+        
+        Returns:
+            Tuple of (rate limited, remaining requests in the window)
+        """
+        ...
+
+class InMemoryShardedBackend:
+    """In-process sliding window counter, sharded by client to keep each dict small."""
+    
+    MAX_CLIENTS = 50_000  # Total tracked clients across all shards
+    
+    def __init__(self, requests_per_minute: int, window_size: int = 60, shards: int = 16):
+        self.requests_per_minute = requests_per_minute
+        self.window_size = window_size
+        # Each shard maps client -> (window index, previous window count, current window count),
+        # kept in least-recently-seen order so eviction is O(1) and no periodic scan is needed
+        self.shards: List[Tuple[threading.Lock, "OrderedDict[str, Tuple[int, int, int]]"]] = [
+            (threading.Lock(), OrderedDict()) for _ in range(shards)
+        ]
+        self.max_clients_per_shard = max(1, self.MAX_CLIENTS // shards)
+    
+    async def hit(self, client_ip: str, now: int) -> Tuple[bool, int]:
+        """Record a request and report whether the client is over the limit."""
+        window = now // self.window_size
+        lock, counters = self.shards[hash(client_ip) % len(self.shards)]
+        
+        with lock:
+            prev_count, curr_count = self._current_counts(counters.get(client_ip), window)
+            
+            # Estimate requests in the last window by weighting the previous window
+            elapsed_fraction = (now % self.window_size) / self.window_size
+            estimate = prev_count * (1 - elapsed_fraction) + curr_count
+            limited = estimate >= self.requests_per_minute
+            if not limited:
+                curr_count += 1
+            
+            counters[client_ip] = (window, prev_count, curr_count)
+            counters.move_to_end(client_ip)
+            
+            # Evict the least recently seen client once the shard is full
+            if len(counters) > self.max_clients_per_shard:
+                counters.popitem(last=False)
+        
+        if limited:
+            return True, 0
+        return False, max(0, self.requests_per_minute - int(estimate) - 1)
+    
+    @staticmethod
+    def _current_counts(entry: Optional[Tuple[int, int, int]], window: int) -> Tuple[int, int]:
+        """Get (previous, current) window counts for an entry, rolled to the given window."""
+        if entry is None:
+            return 0, 0
+        
+        stored_window, prev_count, curr_count = entry
+        if stored_window == window:
+            return prev_count, curr_count
+        if stored_window == window - 1:
+            return curr_count, 0
+        return 0, 0
+
+class RedisSlidingWindowBackend:
+    """Redis-backed rolling window shared by every worker process."""
     
-    def __init__(self, app, requests_per_minute: int = 60):
-        super().__init__(app)
+    # Trim, count and conditionally add in one atomic round trip. Uses the
+    # Redis server clock so all workers agree on the window.
+    HIT_SCRIPT = """
+    local key = KEYS[1]
+    local limit = tonumber(ARGV[1])
+    local window_ms = tonumber(ARGV[2])
+    local member = ARGV[3]
+    local t = redis.call('TIME')
+    local now_ms = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+    redis.call('ZREMRANGEBYSCORE', key, 0, now_ms - window_ms)
+    local count = redis.call('ZCARD', key)
+    if count >= limit then
+        return {1, 0}
+    end
+    redis.call('ZADD', key, now_ms, member)
+    redis.call('PEXPIRE', key, window_ms)
+    return {0, limit - count - 1}
+    """
+    
+    def __init__(self, redis_url: str, requests_per_minute: int, window_size: int = 60):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("Redis not available. Install redis package.")
+        
+        self.requests_per_minute = requests_per_minute
+        self.window_size = window_size
+        self.redis_client = redis.from_url(
+            redis_url,
+            socket_timeout=5,
+            socket_connect_timeout=5
+        )
+        self._hit = self.redis_client.register_script(self.HIT_SCRIPT)
+    
+    async def hit(self, client_ip: str, now: int) -> Tuple[bool, int]:
+        """Record a request and report whether the client is over the limit."""
+        try:
+            limited, remaining = await self._hit(
+                keys=[f"ratelimit:{client_ip}"],
+                args=[self.requests_per_minute, self.window_size * 1000, uuid.uuid4().hex]
+            )
+            return bool(limited), int(remaining)
+        except Exception as e:
+            # Fail open: an unavailable limiter must not take the API down
+            logger.warning("Redis rate limit check failed: %s", e)
+            return False, self.requests_per_minute
+
+class RateLimitMiddleware:
+    """Rate limiting middleware using the sliding window counter algorithm (pure ASGI)."""
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests_per_minute: int = 60,
+        backend: Optional[SlidingWindowBackend] = None
+    ):
+        self.app = app
         self.requests_per_minute = requests_per_minute
         self.window_size = 60  # 1 minute in seconds
-        self.request_times: Dict[str, Deque[float]] = defaultdict(deque)
-        self.cleanup_interval = 300  # Cleanup every 5 minutes
-        self.last_cleanup = time.time()
+        self._limit_header = (b"x-ratelimit-limit", str(requests_per_minute).encode())
+        self._exempt_prefixes = ("/health",)
+        self.backend = backend or InMemoryShardedBackend(requests_per_minute, self.window_size)
     
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request through rate limiting middleware."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Skip rate limiting for health checks
-        if request.url.path.startswith("/health"):
-            return await call_next(request)
+        if scope["path"].startswith(self._exempt_prefixes):
+            await self.app(scope, receive, send)
+            return
         
         # Get client identifier (IP address)
-        client_ip = self.get_client_ip(request)
-        current_time = time.time()
-        
-        # Cleanup old entries periodically
-        if current_time - self.last_cleanup > self.cleanup_interval:
-            await self.cleanup_old_entries(current_time)
-            self.last_cleanup = current_time
-        
-        # Check rate limit
-        if self.is_rate_limited(client_ip, current_time):
-            logger.warning(f"Rate limit exceeded for client {client_ip}")
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "detail": "Rate limit exceeded. Please try again later.",
-                    "retry_after": 60
-                },
-                headers={"Retry-After": "60"}
-            )
+        client_ip = self.get_client_ip(scope)
         
-        # Record request
-        self.request_times[client_ip].append(current_time)
+        # Check rate limit and record request
+        limited, remaining = await self.backend.hit(client_ip, int(time.monotonic()))
+        if limited:
+            logger.warning("Rate limit exceeded for client %s", client_ip)
+            await send({"type": "http.response.start", "status": 429, "headers": list(_RL_429_HEADERS)})
+            await send({"type": "http.response.body", "body": _RL_429_BODY})
+            return
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add rate limit headers in a single splice
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    self._limit_header,
+                    (b"x-ratelimit-remaining", str(remaining).encode()),
+                    (b"x-ratelimit-reset", str(int(time.time()) + self.window_size).encode()),
+                ]
+            await send(message)
         
         # Process request
-        response = await call_next(request)
+        await self.app(scope, receive, send_wrapper)
+    
+    def get_client_ip(self, scope: Scope) -> str:
+        """Extract client IP address from the ASGI scope."""
+        forwarded_for = None
+        real_ip = None
         
-        # Add rate limit headers
-        remaining = max(0, self.requests_per_minute - len(self.request_times[client_ip]))
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(current_time + self.window_size))
+        # Single pass over the raw headers (reverse proxy headers take priority)
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                forwarded_for = value
+                break
+            if name == b"x-real-ip" and real_ip is None:
+                real_ip = value
         
-        return response
-    
-    def get_client_ip(self, request: Request) -> str:
-        """Extract client IP address from request."""
-        # Check for forwarded headers first (reverse proxy)
-        forwarded_for = request.headers.get("X-Forwarded-For")
         if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
+            return forwarded_for.partition(b",")[0].strip().decode("latin-1")
         
-        real_ip = request.headers.get("X-Real-IP")
         if real_ip:
-            return real_ip
+            return real_ip.decode("latin-1")
         
         # Fallback to direct client IP
-        if request.client:
-            return request.client.host
+        client = scope.get("client")
+        if client:
+            return client[0]
         
         return "unknown"
+
+def create_rate_limit_backend(requests_per_minute: int = 60) -> SlidingWindowBackend:
+    """Create the rate limit backend: Redis when enabled so limits hold across workers."""
+    from config.settings import get_settings
+    settings = get_settings()
     
-    def is_rate_limited(self, client_ip: str, current_time: float) -> bool:
-        """Check if client has exceeded rate limit."""
-        request_times = self.request_times[client_ip]
-        
-        # Remove expired entries
-        while request_times and current_time - request_times[0] > self.window_size:
-            request_times.popleft()
-        
-        # Check if rate limit exceeded
-        return len(request_times) >= self.requests_per_minute
+    if settings.REDIS_ENABLED:
+        try:
+            return RedisSlidingWindowBackend(settings.REDIS_URL, requests_per_minute)
+        except Exception as e:
+            logger.warning("Failed to initialize Redis rate limit backend: %s", e)
+            logger.info("Falling back to in-memory rate limiting")
     
-    async def cleanup_old_entries(self, current_time: float) -> None:
-        """Clean up old request entries to prevent memory leaks."""
-        clients_to_remove = []
-        
-        for client_ip, request_times in self.request_times.items():
-            # Remove expired entries
-            while request_times and current_time - request_times[0] > self.window_size:
-                request_times.popleft()
-            
-            # Mark empty queues for removal
-            if not request_times:
-                clients_to_remove.append(client_ip)
-        
-        # Remove empty entries
-        for client_ip in clients_to_remove:
-            del self.request_times[client_ip]
-        
-        logger.debug(f"Rate limiter cleanup: removed {len(clients_to_remove)} empty entries")
+    return InMemoryShardedBackend(requests_per_minute)
@@ -2,7 +2,6 @@
 API dependencies for dependency injection - FIXED VERSION.
 """
 
-from functools import lru_cache
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from app.core.document_processor import DocumentProcessor
@@ -18,23 +17,16 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-@lru_cache()
-def get_document_processor() -> DocumentProcessor:
-    """Get document processor instance."""
-    return DocumentProcessor()
-
-@lru_cache()
-def get_embedding_engine() -> EmbeddingEngine:
-    """Get embedding engine instance."""
+def _create_embedding_engine() -> EmbeddingEngine:
+    """Create the embedding engine instance."""
     settings = get_settings()
     return EmbeddingEngine(
         model_name="sentence-transformers/all-MiniLM-L6-v2",
         cache_dir=settings.EMBEDDINGS_DIR
     )
 
-@lru_cache()
-def get_llm_client() -> LLMClient:
-    """Get LLM client instance."""
+def _create_llm_client() -> LLMClient:
+    """Create the LLM client instance."""
     settings = get_settings()
     
     if not settings.GOOGLE_API_KEY:
@@ -46,14 +38,12 @@ def get_llm_client() -> LLMClient:
         rate_limit=settings.GEMINI_RATE_LIMIT
     )
 
-@lru_cache()
-def get_cache_service() -> Optional[CacheService]:
-    """Get cache service instance if enabled."""
+def _create_cache_service() -> Optional[CacheService]:
+    """Create the cache service instance if enabled."""
     settings = get_settings()
     
     if settings.REDIS_ENABLED:
         try:
-            from app.services.cache_service import CacheService
             return CacheService(redis_url=settings.REDIS_URL)
         except Exception as e:
             logger.warning(f"Failed to initialize Redis cache service: {e}")
@@ -63,6 +53,29 @@ def get_cache_service() -> Optional[CacheService]:
         logger.info("Using in-memory cache (Redis disabled)")
         return InMemoryCache()
 
+# Shared singletons, created once at import so per-request dependency
+# resolution is a plain attribute return.
+_document_processor = DocumentProcessor()
+_embedding_engine = _create_embedding_engine()
+_llm_client = _create_llm_client()
+_cache_service = _create_cache_service()
+
+def get_document_processor() -> DocumentProcessor:
+    """Get document processor instance."""
+    return _document_processor
+
+def get_embedding_engine() -> EmbeddingEngine:
+    """Get embedding engine instance."""
+    return _embedding_engine
+
+def get_llm_client() -> LLMClient:
+    """Get LLM client instance."""
+    return _llm_client
+
+def get_cache_service() -> Optional[CacheService]:
+    """Get cache service instance if enabled."""
+    return _cache_service
+
 def get_query_processor(
     document_processor: DocumentProcessor = Depends(get_document_processor),
     embedding_engine: EmbeddingEngine = Depends(get_embedding_engine),
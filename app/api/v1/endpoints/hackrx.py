@@ -2,9 +2,9 @@
 HackRX API endpoint for document query processing.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Awaitable, Callable, Dict, List
+from fastapi import APIRouter, Depends, HTTPException, Security, status
+from fastapi.security import HTTPBearer
 from app.api.v1.dependencies import get_query_service
 from app.models.request_models import HackRXRequest
 from app.models.response_models import HackRXResponse
@@ -12,34 +12,46 @@ from app.services.query_service import QueryService
 from app.utils.exceptions import (
     DocumentProcessingError,
     EmbeddingGenerationError,
-    LLMProcessingError,
-    ValidationError
+    LLMProcessingError
 )
-from config.settings import get_settings
 import logging
 import asyncio
+import hashlib
+import json
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
-security = HTTPBearer()
-settings = get_settings()
 
-async def verify_bearer_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
-    """Verify bearer token authentication."""
-    if credentials.credentials != settings.BEARER_TOKEN:
-        logger.warning(f"Invalid bearer token attempted: {credentials.credentials[:10]}...")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    return credentials.credentials
+# Authentication is enforced once by AuthMiddleware; the scheme is only
+# attached here so it shows up in the OpenAPI docs.
+security = HTTPBearer(auto_error=False)
+router = APIRouter(dependencies=[Security(security)])
+
+# In-flight /hackrx/run work keyed by request fingerprint, so concurrent
+# identical requests share one computation.
+_inflight: Dict[str, asyncio.Future] = {}
+
+def _request_key(documents_url: str, questions: List[str]) -> str:
+    """Fingerprint a request; question order matters since answers are positional."""
+    payload = json.dumps([documents_url, questions], separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+async def _single_flight(key: str, factory: Callable[[], Awaitable[List[str]]]) -> List[str]:
+    """Run factory once per key, letting concurrent callers await the same result."""
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(factory())
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        logger.info("Joining in-flight identical request")
+    
+    # Shield so one client disconnecting doesn't cancel work others are awaiting
+    return await asyncio.shield(future)
 
 @router.post("/hackrx/run", response_model=HackRXResponse)
 async def process_hackrx_query(
     request: HackRXRequest,
-    query_service: QueryService = Depends(get_query_service),
-    token: str = Depends(verify_bearer_token)
+    query_service: QueryService = Depends(get_query_service)
 ) -> HackRXResponse:
     """
     Process document queries using LLM and vector search.
@@ -47,7 +59,6 @@ async def process_hackrx_query(
     Args:
         request: HackRX request with documents URL and questions
         query_service: Query processing service
-        token: Verified bearer token
     
     Returns:
         HackRXResponse with answers array
@@ -55,51 +66,40 @@ async def process_hackrx_query(
     Raises:
         HTTPException: For various processing errors
     """
-    logger.info(f"Processing HackRX request with {len(request.questions)} questions")
+    logger.info("Processing HackRX request with %d questions", len(request.questions))
     
     try:
-        # Validate request
-        if not request.documents:
-            raise ValidationError("Documents URL is required")
+        # Request shape (URL format, 1-20 non-empty questions) is enforced by HackRXRequest,
+        # so there is no need to re-check it here.
         
-        if not request.questions:
-            raise ValidationError("At least one question is required")
-        
-        if len(request.questions) > 20:
-            raise ValidationError("Maximum 20 questions allowed per request")
-        
-        # Process the request
-        answers = await query_service.process_document_queries(
-            documents_url=request.documents,
-            questions=request.questions
+        # Process the request, coalescing concurrent identical requests
+        answers = await _single_flight(
+            _request_key(request.documents, request.questions),
+            lambda: query_service.process_document_queries(
+                documents_url=request.documents,
+                questions=request.questions
+            )
         )
         
-        logger.info(f"Successfully processed {len(answers)} questions")
+        logger.info("Successfully processed %d questions", len(answers))
         return HackRXResponse(answers=answers)
         
-    except ValidationError as e:
-        logger.error(f"Validation error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    
     except DocumentProcessingError as e:
-        logger.error(f"Document processing error: {e}")
+        logger.error("Document processing error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"Failed to process document: {str(e)}"
         )
     
     except EmbeddingGenerationError as e:
-        logger.error(f"Embedding generation error: {e}")
+        logger.error("Embedding generation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate embeddings"
         )
     
     except LLMProcessingError as e:
-        logger.error(f"LLM processing error: {e}")
+        logger.error("LLM processing error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="LLM service temporarily unavailable"
@@ -113,7 +113,7 @@ async def process_hackrx_query(
         )
     
     except Exception as e:
-        logger.error(f"Unexpected error: {e}", exc_info=True)
+        logger.error("Unexpected error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -2,6 +2,7 @@
 Health check endpoint for monitoring system status.
 """
 
+from typing import Dict, Optional, Tuple
 from fastapi import APIRouter, status
 from app.models.response_models import HealthResponse
 from config.settings import get_settings
@@ -13,6 +14,23 @@ import time
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Expensive probes (model inference, LLM calls) are cached briefly so
+# frequent liveness/readiness polling doesn't hammer them.
+PROBE_TTL_SECONDS = 5
+_probe_cache: Dict[str, Tuple[bool, float]] = {}
+
+def _get_cached_probe(name: str) -> Optional[bool]:
+    """Get a cached probe result if it hasn't expired."""
+    entry = _probe_cache.get(name)
+    if entry and time.monotonic() < entry[1]:
+        return entry[0]
+    return None
+
+def _cache_probe(name: str, result: bool) -> bool:
+    """Cache a probe result for PROBE_TTL_SECONDS."""
+    _probe_cache[name] = (result, time.monotonic() + PROBE_TTL_SECONDS)
+    return result
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
     """
@@ -26,13 +44,24 @@ async def health_check() -> HealthResponse:
     try:
         settings = get_settings()
         
-        # Check components
+        # Check components concurrently; they are independent I/O probes
+        results = await asyncio.gather(
+            check_database(),
+            check_embeddings(),
+            check_llm(),
+            check_storage(),
+            return_exceptions=True
+        )
+        database_ok, embeddings_ok, llm_ok, storage_ok = (
+            result is True for result in results
+        )
+        
         checks = {
             "api": True,  # If we reach here, API is working
-            "database": await check_database(),
-            "embeddings": await check_embeddings(),
-            "llm": await check_llm(),
-            "storage": await check_storage()
+            "database": database_ok,
+            "embeddings": embeddings_ok,
+            "llm": llm_ok,
+            "storage": storage_ok
         }
         
         # Calculate overall health
@@ -85,32 +114,46 @@ async def check_database() -> bool:
 
 async def check_embeddings() -> bool:
     """Check embedding engine availability."""
+    cached = _get_cached_probe("embeddings")
+    if cached is not None:
+        return cached
+    
     try:
-        from app.core.embedding_engine import EmbeddingEngine
-        engine = EmbeddingEngine()
-        await engine.encode(["test"], batch_size=1)
-        return True
+        from app.api.v1.dependencies import get_embedding_engine
+        engine = get_embedding_engine()
+        await engine.encode(["ok"], batch_size=1)
+        return _cache_probe("embeddings", True)
     except Exception as e:
         logger.error(f"Embeddings health check failed: {e}")
-        return False
+        return _cache_probe("embeddings", False)
 
 async def check_llm() -> bool:
     """Check LLM service availability."""
+    cached = _get_cached_probe("llm")
+    if cached is not None:
+        return cached
+    
     try:
-        from app.core.llm_client import LLMClient
-        settings = get_settings()
-        client = LLMClient(
-            api_key=settings.GOOGLE_API_KEY,
-            model_name=settings.GEMINI_MODEL
-        )
+        from app.api.v1.dependencies import get_llm_client
+        client = get_llm_client()
         await client.generate_response("test", max_tokens=10)
-        return True
+        return _cache_probe("llm", True)
     except Exception as e:
         logger.error(f"LLM health check failed: {e}")
-        return False
+        return _cache_probe("llm", False)
 
 async def check_storage() -> bool:
     """Check storage directory accessibility."""
+    cached = _get_cached_probe("storage")
+    if cached is not None:
+        return cached
+    
+    # Filesystem calls block, so run them off the event loop
+    result = await asyncio.to_thread(_sync_check_storage)
+    return _cache_probe("storage", result)
+
+def _sync_check_storage() -> bool:
+    """Check storage directories exist and are writable (blocking)."""
     try:
         import os
         settings = get_settings()
@@ -3,21 +3,83 @@ Enhanced semantic clause matching and similarity scoring with comprehensive
 insurance, legal, HR, and compliance document support.
 """
 
+import asyncio
+import hashlib
+import heapq
 import logging
 import re
-from typing import Dict, List, Optional, Tuple, Set
+import sys
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from types import MappingProxyType
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Pattern, Tuple, Set
 from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import attrgetter
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    njit = None
+
+try:
+    from datasketch import MinHash, MinHashLSH
+    DATASKETCH_AVAILABLE = True
+except ImportError:
+    DATASKETCH_AVAILABLE = False
+    MinHash = MinHashLSH = None
 
 from app.core.embedding_engine import EmbeddingEngine
-from app.utils.text_processing import normalize_text, extract_sentences
+from app.utils.text_processing import normalize_text
 from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# dataclass(slots=True) is only available from Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Word-count buckets for the length boost: <15, 15-30, 31-100, 101-200, >200
+LENGTH_BINS = np.array([15, 31, 101, 201])
+LENGTH_BOOSTS = np.array([-0.1, 0.0, 0.1, 0.15, 0.1])
+
+# Batches larger than this have near-duplicate chunks collapsed before scoring
+DEDUP_MIN_CHUNKS = 500
+DEDUP_THRESHOLD = 0.9
+DEDUP_NUM_PERM = 64
+DEDUP_SHINGLE_SIZE = 3
+
+# Ranking of relevant clauses: confidence first, then the finer signals
+MATCH_RANK_KEY = attrgetter('confidence', 'similarity_score', 'keyword_density', 'regulatory_score')
+
+# Ranking of extracted clauses of one type
+EXTRACTION_RANK_KEY = attrgetter('confidence', 'similarity_score', 'pattern_count')
+
+# Feature kinds recorded by the fused chunk scan
+PATTERN_FEATURE, CONTEXT_FEATURE, HIGH_VALUE_FEATURE, MEDIUM_VALUE_FEATURE = range(4)
+
+# Kinds of query terms found by the keyword density scan
+QUERY_WORD, QUERY_PHRASE, QUERY_TEXT = range(3)
+
+# Words ignored when measuring query/chunk keyword overlap
+STOP_WORDS = frozenset({
+    'the', 'is', 'are', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 
+    'for', 'of', 'with', 'by', 'from', 'as', 'an', 'a', 'this', 'that',
+    'these', 'those', 'be', 'been', 'being', 'have', 'has', 'had',
+    'do', 'does', 'did', 'will', 'would', 'should', 'could', 'can'
+})
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ClauseMatch:
     """Enhanced clause match with comprehensive metadata."""
     text: str
@@ -26,11 +88,619 @@ class ClauseMatch:
     chunk_index: int
     clause_type: str
     confidence: float
-    metadata: Dict = field(default_factory=dict)
-    pattern_matches: List[str] = field(default_factory=list)
+    metadata: Dict = field(default_factory=dict)  # Fresh dict per match, never shared
+    pattern_matches: Tuple[int, ...] = ()  # Pattern IDs, see CLAUSE_SCANNER.patterns
     keyword_density: float = 0.0
     context_relevance: float = 0.0
     regulatory_score: float = 0.0
+    pattern_count: int = field(init=False)  # len(pattern_matches), for ranking
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'pattern_count', len(self.pattern_matches))
+    
+    @property
+    def matched_patterns(self) -> Tuple[str, ...]:
+        """The clause patterns behind pattern_matches."""
+        return tuple(CLAUSE_SCANNER.patterns[pattern_id] for pattern_id in self.pattern_matches)
+
+@dataclass(frozen=True)
+class QueryTerms:
+    """A query normalized once for keyword density scoring."""
+    text: str
+    words: frozenset
+    phrases: Tuple[str, ...]
+    # Aho-Corasick automaton over words, phrases and the full text, when available
+    automaton: Optional[object] = None
+
+@dataclass(frozen=True)
+class ClauseScanPlan:
+    """Query-side scan state, resolved once and reused for every chunk."""
+    clause_types: Tuple[str, ...]
+    wanted: frozenset
+    # Clause weights pre-scaled by the 0.1 boost each match or indicator is worth
+    boost_weights: np.ndarray
+    # (clause type, alternation of its patterns, (pattern ID, compiled pattern) pairs)
+    regexes: Tuple[Tuple[str, Pattern, Tuple[Tuple[int, Pattern], ...]], ...]
+
+class ClausePatternScanner:
+    """
+    Multi-pattern scanner that reports matches grouped by clause type.
+    
+    Patterns are matched against the lowercased text, and every pattern
+    counts its own non-overlapping matches, as re.findall would. Plain
+    lowercase literals (the majority of clause patterns) go into one
+    Aho-Corasick automaton, so they are found in a single pass over the text
+    regardless of how many there are. Real regexes are compiled one by one;
+    an alternation of a clause type's regexes is searched first, so the
+    per-pattern scans only run for types with at least one hit. Patterns
+    written with capitals (such as 'PED' or 'UIN') can never match the
+    lowercased text and are left out.
+    
+    Every distinct pattern gets an integer ID (an index into patterns), and
+    matches are reported as IDs so no string is built per hit.
+    
+    Optional presence terms (context indicators, insurance vocabulary) ride
+    along in the same automaton; for those only which terms occur is reported.
+    """
+    
+    _REGEX_METACHARACTERS = frozenset('\\.^$*+?{}[]|()')
+    
+    def __init__(
+        self,
+        clause_patterns: Mapping[str, Iterable[str]],
+        presence_terms: Optional[Dict[Tuple[int, str], Iterable[str]]] = None
+    ):
+        # literal -> list of (feature kind, key) it counts towards
+        literal_features: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+        regex_patterns: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+        self.pattern_ids: Dict[str, int] = {}
+        
+        for clause_type, patterns in clause_patterns.items():
+            for pattern in patterns:
+                pattern_id = self.pattern_ids.setdefault(pattern, len(self.pattern_ids))
+                if any(c.isupper() for c in pattern):
+                    continue
+                if (AHOCORASICK_AVAILABLE and pattern.islower()
+                        and not self._REGEX_METACHARACTERS.intersection(pattern)):
+                    literal_features[pattern].append((PATTERN_FEATURE, clause_type))
+                    continue
+                regex_patterns[clause_type].append((pattern_id, pattern))
+        
+        # Pattern ID -> pattern, for resolving reported matches
+        self.patterns: Tuple[str, ...] = tuple(self.pattern_ids)
+        
+        self.presence_terms = {
+            feature: tuple(terms) for feature, terms in (presence_terms or {}).items()
+        }
+        if AHOCORASICK_AVAILABLE:
+            for feature, terms in self.presence_terms.items():
+                for term in terms:
+                    literal_features[term].append(feature)
+        
+        self.automaton = None
+        if literal_features:
+            self.automaton = ahocorasick.Automaton()
+            for literal, features in literal_features.items():
+                self.automaton.add_word(
+                    literal, (literal, self.pattern_ids.get(literal, -1), tuple(features))
+                )
+            self.automaton.make_automaton()
+        
+        # The alternation finds a match exactly when one of its patterns does
+        self.regexes = {
+            clause_type: (
+                clause_type,
+                re.compile('|'.join(f'(?:{pattern})' for _, pattern in patterns)),
+                tuple((pattern_id, re.compile(pattern)) for pattern_id, pattern in patterns)
+            )
+            for clause_type, patterns in regex_patterns.items()
+        }
+    
+    def plan(self, clause_types: Iterable[str], clause_weights: Mapping[str, float]) -> ClauseScanPlan:
+        """Resolve the active clause types, their weights and regexes for one query."""
+        clause_types = tuple(clause_types)
+        return ClauseScanPlan(
+            clause_types=clause_types,
+            wanted=frozenset(clause_types),
+            boost_weights=0.1 * np.array(
+                [clause_weights.get(clause_type, 1.0) for clause_type in clause_types]
+            ),
+            regexes=tuple(
+                self.regexes[clause_type] for clause_type in clause_types if clause_type in self.regexes
+            )
+        )
+    
+    def scan(
+        self, 
+        text: str, 
+        plan: Optional[ClauseScanPlan] = None, 
+        text_lower: Optional[str] = None
+    ) -> Dict[str, List[int]]:
+        """Find the IDs of the patterns matching in text, by clause type."""
+        return self.scan_features(text, plan, text_lower)[0]
+    
+    def count(self, text: str) -> Dict[str, int]:
+        """Count pattern matches per clause type without collecting the matched strings."""
+        return {
+            clause_type: len(pattern_ids)
+            for clause_type, pattern_ids in self.scan(text).items()
+        }
+    
+    def scan_features(
+        self, 
+        text: str, 
+        plan: Optional[ClauseScanPlan] = None,
+        text_lower: Optional[str] = None
+    ) -> Tuple[Dict[str, List[int]], Dict[Tuple[int, str], Set[str]]]:
+        """
+        Scan text once for clause patterns and presence terms.
+        
+        Args:
+            text: Text to scan
+            plan: Restricts pattern matches to the plan's clause types; all types if omitted
+            text_lower: text.lower(), when the caller already has it
+        
+        Returns:
+            Tuple of (IDs of matched patterns by clause type, one per hit, and
+            presence terms found by feature)
+        """
+        wanted = None if plan is None else plan.wanted
+        regexes = self.regexes.values() if plan is None else plan.regexes
+        matches: Dict[str, List[int]] = defaultdict(list)
+        present: Dict[Tuple[int, str], Set[str]] = defaultdict(set)
+        if text_lower is None:
+            text_lower = text.lower()
+        
+        if self.automaton is not None:
+            # End of the last counted hit of each literal pattern; the automaton
+            # reports overlapping hits of a literal, findall would not
+            last_end: Dict[str, int] = {}
+            for end, (literal, pattern_id, features) in self.automaton.iter(text_lower):
+                counted = True
+                if pattern_id >= 0:
+                    counted = end - len(literal) >= last_end.get(literal, -1)
+                    if counted:
+                        last_end[literal] = end
+                for kind, key in features:
+                    if kind == PATTERN_FEATURE:
+                        if counted and (wanted is None or key in wanted):
+                            matches[key].append(pattern_id)
+                    else:
+                        present[kind, key].add(literal)
+        else:
+            for feature, terms in self.presence_terms.items():
+                found = {term for term in terms if term in text_lower}
+                if found:
+                    present[feature] = found
+        
+        for clause_type, alternation, compiled_patterns in regexes:
+            if alternation.search(text_lower) is None:
+                continue
+            for pattern_id, compiled in compiled_patterns:
+                for _ in compiled.finditer(text_lower):
+                    matches[clause_type].append(pattern_id)
+        
+        return matches, present
+
+# MASSIVELY EXPANDED clause patterns for comprehensive insurance coverage
+CLAUSE_PATTERNS = {
+    # Waiting Period Clauses (Enhanced)
+    'waiting_period': [
+        r'waiting period', r'wait(?:ing)?\s+time', r'cooling off period', r'exclusion period',
+        r'probation period', r'elimination period', r'pre-coverage period', r'initial waiting',
+        r'qualification period', r'\b\d+\s*months?\s*waiting', r'\b\d+\s*years?\s*waiting',
+        r'continuous coverage\s*\d+', r'from inception\s*\d+', r'policy commencement\s*\d+',
+        r'thirty[\-\s]?six\s*months', r'24\s*months\s*waiting', r'two\s*years?\s*waiting',
+        r'36\s*months?\s*continuous', r'waiting\s*period\s*of\s*\d+', r'wait\s*for\s*\d+'
+    ],
+
+    # Grace Period Clauses (Enhanced)
+    'grace_period': [
+        r'grace period', r'grace time', r'payment grace', r'premium grace',
+        r'grace\s*days?', r'payment\s*window', r'premium\s*extension', r'renewal\s*grace',
+        r'thirty\s*days?\s*grace', r'30\s*days?\s*grace', r'payment\s*tolerance',
+        r'late\s*payment\s*allowance', r'premium\s*payment\s*grace', r'renewal\s*extension',
+        r'policy\s*continuation', r'continuity\s*grace', r'uninterrupted\s*coverage'
+    ],
+
+    # Coverage Clauses (Massively Enhanced)
+    'coverage': [
+        r'coverage', r'covered', r'benefits?', r'indemnity', r'compensation',
+        r'reimbursement', r'protection', r'insured\s*amount', r'sum\s*insured',
+        r'policy\s*limit', r'maximum\s*coverage', r'benefit\s*limit', r'covered\s*expenses',
+        r'eligible\s*expenses', r'payable\s*benefits', r'insured\s*benefits',
+        r'medical\s*coverage', r'treatment\s*coverage', r'hospitalization\s*benefits',
+        r'surgical\s*benefits', r'therapeutic\s*benefits', r'diagnostic\s*coverage'
+    ],
+
+    # Exclusion Clauses (Enhanced)
+    'exclusion': [
+        r'exclusion', r'excluded', r'not covered', r'exception', r'limitation',
+        r'restriction', r'excluded\s*condition', r'non[\-\s]?covered', r'not\s*payable',
+        r'disallowed', r'ineligible', r'non[\-\s]?reimbursable', r'excluded\s*treatment',
+        r'excluded\s*service', r'excluded\s*benefit', r'policy\s*exclusions',
+        r'coverage\s*exclusions', r'benefit\s*exclusions', r'treatment\s*exclusions'
+    ],
+
+    # Premium and Payment Clauses (Enhanced)
+    'premium': [
+        r'premium', r'payment', r'installment', r'contribution', r'policy\s*payment',
+        r'insurance\s*premium', r'premium\s*amount', r'premium\s*charges',
+        r'policy\s*charges', r'premium\s*cost', r'premium\s*rate', r'annual\s*premium',
+        r'monthly\s*premium', r'quarterly\s*premium', r'premium\s*due',
+        r'payment\s*schedule', r'premium\s*payment', r'installment\s*payment'
+    ],
+
+    # Maternity Clauses (Enhanced)
+    'maternity': [
+        r'maternity', r'pregnancy', r'childbirth', r'delivery', r'obstetric',
+        r'prenatal', r'postnatal', r'antenatal', r'maternal', r'expectant\s*mother',
+        r'pregnant\s*woman', r'newborn', r'confinement', r'labor\s*and\s*delivery',
+        r'caesarean', r'c[\-\s]?section', r'normal\s*delivery', r'pregnancy\s*care',
+        r'maternity\s*expenses', r'pregnancy\s*coverage', r'maternity\s*benefits'
+    ],
+
+    # Pre-existing Disease Clauses (Enhanced)
+    'pre_existing': [
+        r'pre[\-\s]?existing', r'existing\s*condition', r'prior\s*condition',
+        r'previous\s*illness', r'pre[\-\s]?existing\s*disease', r'PED',
+        r'existing\s*medical\s*condition', r'prior\s*medical\s*history',
+        r'chronic\s*condition', r'hereditary\s*condition', r'congenital\s*condition',
+        r'existing\s*ailment', r'prior\s*ailment', r'existing\s*disease',
+        r'pre[\-\s]?existing\s*illness', r'pre[\-\s]?existing\s*medical'
+    ],
+
+    # Deductible and Co-pay Clauses (Enhanced)
+    'deductible': [
+        r'deductible', r'excess', r'co[\-\s]?pay', r'out\s*of\s*pocket',
+        r'self\s*retention', r'franchise', r'co[\-\s]?payment', r'copayment',
+        r'deductible\s*amount', r'excess\s*amount', r'co[\-\s]?pay\s*amount',
+        r'patient\s*contribution', r'member\s*contribution', r'cost\s*sharing'
+    ],
+
+    # Air Ambulance Clauses (NEW - Critical)
+    'air_ambulance': [
+        r'air\s*ambulance', r'helicopter\s*ambulance', r'medical\s*helicopter',
+        r'aviation\s*ambulance', r'air\s*medical\s*transport', r'emergency\s*aviation',
+        r'medical\s*aviation', r'flight\s*ambulance', r'aerial\s*ambulance',
+        r'medical\s*flight', r'emergency\s*helicopter', r'air\s*medical\s*service',
+        r'helicopter\s*medical\s*service', r'aeromedical\s*transport',
+        r'medical\s*evacuation', r'air\s*evacuation', r'emergency\s*air\s*transport'
+    ],
+
+    # Distance and Travel Clauses (NEW)
+    'distance_travel': [
+        r'distance', r'travel\s*distance', r'kilometer', r'kilometre', r'km',
+        r'\d+\s*km', r'\d+\s*kilometer', r'maximum\s*distance', r'travel\s*limit',
+        r'distance\s*limit', r'coverage\s*distance', r'service\s*range',
+        r'operational\s*range', r'travel\s*range', r'150\s*km', r'one\s*hundred\s*fifty'
+    ],
+
+    # Well Mother/Baby Clauses (NEW - Critical)
+    'well_mother': [
+        r'well\s*mother', r'mother\s*wellness', r'maternal\s*wellness',
+        r'expectant\s*mother\s*care', r'pregnancy\s*wellness', r'maternal\s*health',
+        r'mother\s*care', r'maternal\s*care', r'well\s*mother\s*cover',
+        r'well\s*mother\s*benefits', r'mother\s*wellness\s*program'
+    ],
+
+    'well_baby': [
+        r'well\s*baby', r'baby\s*wellness', r'infant\s*wellness', r'newborn\s*care',
+        r'baby\s*care', r'infant\s*care', r'neonatal\s*care', r'baby\s*health',
+        r'infant\s*health', r'newborn\s*wellness', r'well\s*baby\s*expenses',
+        r'healthy\s*baby', r'baby\s*medical\s*care', r'infant\s*medical\s*care'
+    ],
+
+    # Routine Care Clauses (NEW)
+    'routine_care': [
+        r'routine\s*medical\s*care', r'routine\s*care', r'preventive\s*care',
+        r'wellness\s*care', r'health\s*maintenance', r'regular\s*checkup',
+        r'routine\s*checkup', r'standard\s*care', r'basic\s*medical\s*care',
+        r'health\s*screening', r'wellness\s*services', r'preventive\s*medicine'
+    ],
+
+    # UIN and Regulatory Clauses (NEW - Critical)
+    'regulatory': [
+        r'UIN', r'unique\s*identification\s*number', r'product\s*identification',
+        r'regulatory\s*number', r'approval\s*number', r'license\s*number',
+        r'registration\s*number', r'product\s*code', r'policy\s*code',
+        r'base\s*product', r'add[\-\s]?on', r'rider', r'endorsement',
+        r'competent\s*authority', r'government\s*authority', r'regulatory\s*authority'
+    ],
+
+    # Licensing and Certification Clauses (NEW)
+    'licensing': [
+        r'licensed', r'certified', r'authorized', r'approved', r'accredited',
+        r'registered', r'qualified', r'permitted', r'duly\s*licensed',
+        r'competent\s*government\s*authority', r'licensing\s*authority',
+        r'regulatory\s*body', r'certification\s*authority', r'official\s*authority'
+    ],
+
+    # Table and Benefits Clauses (NEW)
+    'table_benefits': [
+        r'table\s*of\s*benefits', r'benefit\s*table', r'coverage\s*table',
+        r'benefit\s*schedule', r'coverage\s*schedule', r'policy\s*schedule',
+        r'benefits\s*chart', r'coverage\s*chart', r'benefit\s*summary',
+        r'coverage\s*summary', r'schedule\s*of\s*benefits'
+    ],
+
+    # Multiple Birth Clauses (NEW)
+    'multiple_birth': [
+        r'multiple\s*birth', r'multiple\s*babies', r'twins', r'triplets',
+        r'quadruplets', r'multiple\s*children', r'multiple\s*newborn',
+        r'twin\s*birth', r'multiple\s*deliveries', r'simultaneous\s*birth'
+    ],
+
+    # Proportionate Payment Clauses (NEW)
+    'proportionate_payment': [
+        r'proportionate', r'proportional', r'pro[\-\s]?rata', r'partial\s*payment',
+        r'reduced\s*payment', r'scaled\s*payment', r'adjusted\s*payment',
+        r'calculated\s*payment', r'percentage\s*payment', r'ratio[\-\s]?based'
+    ],
+
+    # Period Options Clauses (NEW)
+    'period_options': [
+        r'period\s*option', r'coverage\s*period', r'policy\s*period',
+        r'benefit\s*period', r'three\s*period', r'multiple\s*period',
+        r'period\s*choice', r'coverage\s*option', r'benefit\s*option'
+    ],
+
+    # Medical Examination Clauses (NEW)
+    'medical_examination': [
+        r'medical\s*examination', r'health\s*checkup', r'medical\s*checkup',
+        r'customary\s*examination', r'routine\s*examination', r'health\s*assessment',
+        r'medical\s*assessment', r'clinical\s*examination', r'physical\s*examination',
+        r'diagnostic\s*examination', r'screening\s*examination'
+    ],
+
+    # Sum Insured and Limits (Enhanced)
+    'sum_insured_limits': [
+        r'sum\s*insured', r'insured\s*amount', r'coverage\s*amount', r'policy\s*limit',
+        r'maximum\s*coverage', r'benefit\s*limit', r'coverage\s*limit',
+        r'insurance\s*limit', r'maximum\s*benefit', r'benefit\s*amount',
+        r'room\s*rent\s*limit', r'ICU\s*limit', r'sub[\-\s]?limit', r'1%\s*of\s*SI',
+        r'2%\s*of\s*SI', r'percentage\s*of\s*sum\s*insured'
+    ],
+
+    # Plan Types (Enhanced)
+    'plan_types': [
+        r'plan\s*A', r'plan\s*B', r'plan\s*C', r'basic\s*plan', r'standard\s*plan',
+        r'premium\s*plan', r'option\s*A', r'option\s*B', r'package\s*A',
+        r'package\s*B', r'scheme\s*A', r'scheme\s*B', r'variant\s*A'
+    ],
+
+    # AYUSH Treatment (Enhanced)
+    'ayush_treatment': [
+        r'AYUSH', r'ayurveda', r'yoga', r'naturopathy', r'unani', r'siddha',
+        r'homeopathy', r'alternative\s*medicine', r'traditional\s*medicine',
+        r'ayurvedic\s*treatment', r'homeopathic\s*treatment', r'natural\s*medicine',
+        r'AYUSH\s*hospital', r'AYUSH\s*treatment', r'ayurvedic\s*hospital'
+    ],
+
+    # Hospital Definition (Enhanced)
+    'hospital_definition': [
+        r'hospital', r'medical\s*institution', r'healthcare\s*facility',
+        r'nursing\s*home', r'medical\s*center', r'clinic', r'healthcare\s*center',
+        r'\d+\s*bed', r'minimum\s*bed', r'inpatient\s*bed', r'qualified\s*nursing',
+        r'operation\s*theatre', r'medical\s*practitioner', r'24\s*hours?',
+        r'round\s*the\s*clock', r'full\s*time'
+    ]
+}
+
+# Enhanced relationship mapping for insurance clauses
+CLAUSE_RELATIONSHIPS = {
+    'dependencies': {
+        'waiting_period': ['coverage', 'pre_existing', 'maternity'],
+        'grace_period': ['premium'],  
+        'maternity': ['waiting_period', 'coverage'],
+        'well_mother': ['maternity', 'routine_care'],
+        'well_baby': ['maternity', 'routine_care'],
+        'air_ambulance': ['licensing', 'distance_travel', 'table_benefits'],
+        'proportionate_payment': ['distance_travel', 'air_ambulance'],
+        'regulatory': ['licensing', 'table_benefits']
+    },
+    'conflicts': {
+        'coverage': ['exclusion'],
+        'benefits': ['exclusion'],
+        'air_ambulance': ['exclusion'],
+        'well_mother': ['exclusion'],
+        'well_baby': ['exclusion']
+    },
+    'related': {
+        'waiting_period': ['pre_existing', 'coverage'],
+        'maternity': ['well_mother', 'well_baby'],
+        'air_ambulance': ['distance_travel', 'proportionate_payment'],
+        'regulatory': ['licensing', 'table_benefits'],
+        'routine_care': ['well_mother', 'well_baby']
+    }
+}
+
+# Enhanced scoring weights for different clause types
+CLAUSE_WEIGHTS = {
+    'air_ambulance': 1.5,          # High priority for test document
+    'well_mother': 1.4,            # High priority for test document  
+    'well_baby': 1.4,              # High priority for test document
+    'regulatory': 1.3,             # Important for UIN queries
+    'distance_travel': 1.3,        # Important for air ambulance queries
+    'proportionate_payment': 1.2,  # Important for calculation queries
+    'waiting_period': 1.1,         # Standard insurance clause
+    'grace_period': 1.1,           # Standard insurance clause
+    'maternity': 1.1,              # Standard insurance clause
+    'pre_existing': 1.1,           # Standard insurance clause
+    'coverage': 1.0,               # Base weight
+    'exclusion': 1.0,              # Base weight
+    'premium': 1.0,                # Base weight
+    'deductible': 1.0              # Base weight
+}
+
+# Context indicators for different clause types
+CONTEXT_INDICATORS = {
+    'air_ambulance': ['hospital', 'emergency', 'medical', 'transport', 'evacuation'],
+    'well_mother': ['pregnancy', 'maternal', 'delivery', 'prenatal', 'postnatal'],
+    'well_baby': ['newborn', 'infant', 'baby', 'neonatal', 'pediatric'],
+    'regulatory': ['authority', 'government', 'approval', 'license', 'compliance'],
+    'waiting_period': ['months', 'years', 'continuous', 'inception', 'commencement'],
+    'grace_period': ['payment', 'premium', 'renewal', 'due', 'extension'],
+    'maternity': ['pregnancy', 'delivery', 'childbirth', 'obstetric', 'labor']
+}
+
+# High-value insurance terms
+HIGH_VALUE_TERMS = (
+    'sum insured', 'policy limit', 'coverage amount', 'benefit limit',
+    'waiting period', 'grace period', 'pre-existing', 'maternity',
+    'air ambulance', 'well mother', 'well baby', 'proportionate',
+    'licensed authority', 'competent authority', 'table of benefits'
+)
+
+# Medium-value insurance terms
+MEDIUM_VALUE_TERMS = (
+    'premium', 'deductible', 'co-pay', 'exclusion', 'coverage',
+    'benefit', 'treatment', 'hospitalization', 'medical expenses',
+    'reimbursement', 'indemnity', 'compensation'
+)
+
+# Regulatory/technical markers, matched on the upper-cased text. The scoring
+# has always used only these two: the lowercase word patterns it was listed
+# with ('authority', 'licens*', 'approval', ...) can never match upper-cased
+# text, so they are not scanned for.
+REGULATORY_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\b[A-Z]{2,}[0-9]{2,}[A-Z0-9]*\b',  # UIN patterns
+    r'\bUIN\b'
+))
+
+# The tables above are shared by every ClauseMatcher and baked into memoized
+# lookups, so they are frozen: read-only mappings over tuples
+CLAUSE_PATTERNS = MappingProxyType({
+    clause_type: tuple(patterns) for clause_type, patterns in CLAUSE_PATTERNS.items()
+})
+CLAUSE_RELATIONSHIPS = MappingProxyType({
+    kind: MappingProxyType({clause_type: tuple(others) for clause_type, others in table.items()})
+    for kind, table in CLAUSE_RELATIONSHIPS.items()
+})
+CLAUSE_WEIGHTS = MappingProxyType(CLAUSE_WEIGHTS)
+CONTEXT_INDICATORS = MappingProxyType({
+    clause_type: tuple(terms) for clause_type, terms in CONTEXT_INDICATORS.items()
+})
+
+# Built once at import and shared by all ClauseMatcher instances
+CLAUSE_SCANNER = ClausePatternScanner(CLAUSE_PATTERNS, {
+    **{(CONTEXT_FEATURE, clause_type): terms for clause_type, terms in CONTEXT_INDICATORS.items()},
+    (HIGH_VALUE_FEATURE, ''): HIGH_VALUE_TERMS,
+    (MEDIUM_VALUE_FEATURE, ''): MEDIUM_VALUE_TERMS
+})
+
+class ScoreCache:
+    """
+    Bounded least-recently-used map from keys to chunk scores.
+    
+    The same chunks come back for most questions about a document, so their
+    scores are kept keyed on a digest of the chunk text rather than the text
+    itself. Scoring runs in worker threads, so access is guarded by a lock.
+    """
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._scores: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[float]:
+        with self._lock:
+            score = self._scores.get(key)
+            if score is not None:
+                self._scores.move_to_end(key)
+            return score
+    
+    def put(self, key: Hashable, score: float) -> None:
+        with self._lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            if len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
+
+def _text_digest(text: str) -> bytes:
+    """16-byte digest identifying a chunk text in the score caches."""
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+# Regulatory scores by chunk text digest
+REGULATORY_CACHE_SIZE = 16384
+_regulatory_scores = ScoreCache(REGULATORY_CACHE_SIZE)
+
+# Keyword densities by (normalized query, chunk text digest)
+KEYWORD_DENSITY_CACHE_SIZE = 16384
+_keyword_densities = ScoreCache(KEYWORD_DENSITY_CACHE_SIZE)
+
+@lru_cache(maxsize=4096)
+def _identify_clause_types(query: str) -> Tuple[str, ...]:
+    """Rank the clause types a query is about (top 3, or 'general')."""
+    # Check against all patterns with priority scoring
+    type_scores = {}
+    
+    for clause_type, score in CLAUSE_SCANNER.count(query).items():
+        if score > 0:
+            # Apply clause weight multiplier
+            type_scores[clause_type] = score * CLAUSE_WEIGHTS.get(clause_type, 1.0)
+    
+    # Sort by weighted score and return top types
+    sorted_types = sorted(type_scores.items(), key=lambda x: x[1], reverse=True)
+    
+    # Return top 3 clause types or all if less than 3, defaulting to general
+    return tuple(t[0] for t in sorted_types[:3]) or ('general',)
+
+@lru_cache(maxsize=256)
+def _scan_plan(clause_types: Tuple[str, ...]) -> ClauseScanPlan:
+    """Scan plan for a clause type ranking; the weights table is fixed at import."""
+    return CLAUSE_SCANNER.plan(clause_types, CLAUSE_WEIGHTS)
+
+@lru_cache(maxsize=4096)
+def _query_terms(query: str) -> QueryTerms:
+    """Normalize a query into the pieces keyword density needs."""
+    query_text = normalize_text(query)
+    query_tokens = query_text.split()
+    query_phrases = tuple(
+        ' '.join(query_tokens[i:i+2]) for i in range(len(query_tokens) - 1)
+    )
+    query_words = frozenset(query_tokens) - STOP_WORDS
+    
+    automaton = None
+    if AHOCORASICK_AVAILABLE and query_words:
+        # One key may be a word, a phrase and the whole query at once
+        term_kinds: Dict[str, Set[int]] = defaultdict(set)
+        for word in query_words:
+            term_kinds[word].add(QUERY_WORD)
+        for phrase in query_phrases:
+            term_kinds[phrase].add(QUERY_PHRASE)
+        term_kinds[query_text].add(QUERY_TEXT)
+        
+        automaton = ahocorasick.Automaton()
+        for term, kinds in term_kinds.items():
+            automaton.add_word(term, (term, frozenset(kinds)))
+        automaton.make_automaton()
+    
+    return QueryTerms(
+        text=query_text,
+        words=query_words,
+        phrases=query_phrases,
+        automaton=automaton
+    )
+
+def _regulatory_score(text: str) -> float:
+    """Score regulatory/technical markers in text, remembered across calls."""
+    key = _text_digest(text)
+    score = _regulatory_scores.get(key)
+    if score is not None:
+        return score
+    
+    # Each pattern adds 0.1 per match, summed in pattern order
+    text_upper = text.upper()
+    score = 0.0
+    for pattern in REGULATORY_PATTERNS:
+        matches = sum(1 for _ in pattern.finditer(text_upper))
+        if matches > 0:
+            score += matches * 0.1
+    score = min(1.0, score)
+    
+    _regulatory_scores.put(key, score)
+    return score
 
 class ClauseMatcher:
     """Enhanced semantic clause matching with comprehensive insurance domain knowledge."""
@@ -39,256 +709,11 @@ class ClauseMatcher:
         self.embedding_engine = embedding_engine
         self.settings = get_settings()
         
-        # MASSIVELY EXPANDED clause patterns for comprehensive insurance coverage
-        self.clause_patterns = {
-            # Waiting Period Clauses (Enhanced)
-            'waiting_period': [
-                r'waiting period', r'wait(?:ing)?\s+time', r'cooling off period', r'exclusion period',
-                r'probation period', r'elimination period', r'pre-coverage period', r'initial waiting',
-                r'qualification period', r'\b\d+\s*months?\s*waiting', r'\b\d+\s*years?\s*waiting',
-                r'continuous coverage\s*\d+', r'from inception\s*\d+', r'policy commencement\s*\d+',
-                r'thirty[\-\s]?six\s*months', r'24\s*months\s*waiting', r'two\s*years?\s*waiting',
-                r'36\s*months?\s*continuous', r'waiting\s*period\s*of\s*\d+', r'wait\s*for\s*\d+'
-            ],
-            
-            # Grace Period Clauses (Enhanced)
-            'grace_period': [
-                r'grace period', r'grace time', r'payment grace', r'premium grace',
-                r'grace\s*days?', r'payment\s*window', r'premium\s*extension', r'renewal\s*grace',
-                r'thirty\s*days?\s*grace', r'30\s*days?\s*grace', r'payment\s*tolerance',
-                r'late\s*payment\s*allowance', r'premium\s*payment\s*grace', r'renewal\s*extension',
-                r'policy\s*continuation', r'continuity\s*grace', r'uninterrupted\s*coverage'
-            ],
-            
-            # Coverage Clauses (Massively Enhanced)
-            'coverage': [
-                r'coverage', r'covered', r'benefits?', r'indemnity', r'compensation',
-                r'reimbursement', r'protection', r'insured\s*amount', r'sum\s*insured',
-                r'policy\s*limit', r'maximum\s*coverage', r'benefit\s*limit', r'covered\s*expenses',
-                r'eligible\s*expenses', r'payable\s*benefits', r'insured\s*benefits',
-                r'medical\s*coverage', r'treatment\s*coverage', r'hospitalization\s*benefits',
-                r'surgical\s*benefits', r'therapeutic\s*benefits', r'diagnostic\s*coverage'
-            ],
-            
-            # Exclusion Clauses (Enhanced)
-            'exclusion': [
-                r'exclusion', r'excluded', r'not covered', r'exception', r'limitation',
-                r'restriction', r'excluded\s*condition', r'non[\-\s]?covered', r'not\s*payable',
-                r'disallowed', r'ineligible', r'non[\-\s]?reimbursable', r'excluded\s*treatment',
-                r'excluded\s*service', r'excluded\s*benefit', r'policy\s*exclusions',
-                r'coverage\s*exclusions', r'benefit\s*exclusions', r'treatment\s*exclusions'
-            ],
-            
-            # Premium and Payment Clauses (Enhanced)
-            'premium': [
-                r'premium', r'payment', r'installment', r'contribution', r'policy\s*payment',
-                r'insurance\s*premium', r'premium\s*amount', r'premium\s*charges',
-                r'policy\s*charges', r'premium\s*cost', r'premium\s*rate', r'annual\s*premium',
-                r'monthly\s*premium', r'quarterly\s*premium', r'premium\s*due',
-                r'payment\s*schedule', r'premium\s*payment', r'installment\s*payment'
-            ],
-            
-            # Maternity Clauses (Enhanced)
-            'maternity': [
-                r'maternity', r'pregnancy', r'childbirth', r'delivery', r'obstetric',
-                r'prenatal', r'postnatal', r'antenatal', r'maternal', r'expectant\s*mother',
-                r'pregnant\s*woman', r'newborn', r'confinement', r'labor\s*and\s*delivery',
-                r'caesarean', r'c[\-\s]?section', r'normal\s*delivery', r'pregnancy\s*care',
-                r'maternity\s*expenses', r'pregnancy\s*coverage', r'maternity\s*benefits'
-            ],
-            
-            # Pre-existing Disease Clauses (Enhanced)
-            'pre_existing': [
-                r'pre[\-\s]?existing', r'existing\s*condition', r'prior\s*condition',
-                r'previous\s*illness', r'pre[\-\s]?existing\s*disease', r'PED',
-                r'existing\s*medical\s*condition', r'prior\s*medical\s*history',
-                r'chronic\s*condition', r'hereditary\s*condition', r'congenital\s*condition',
-                r'existing\s*ailment', r'prior\s*ailment', r'existing\s*disease',
-                r'pre[\-\s]?existing\s*illness', r'pre[\-\s]?existing\s*medical'
-            ],
-            
-            # Deductible and Co-pay Clauses (Enhanced)
-            'deductible': [
-                r'deductible', r'excess', r'co[\-\s]?pay', r'out\s*of\s*pocket',
-                r'self\s*retention', r'franchise', r'co[\-\s]?payment', r'copayment',
-                r'deductible\s*amount', r'excess\s*amount', r'co[\-\s]?pay\s*amount',
-                r'patient\s*contribution', r'member\s*contribution', r'cost\s*sharing'
-            ],
-            
-            # Air Ambulance Clauses (NEW - Critical)
-            'air_ambulance': [
-                r'air\s*ambulance', r'helicopter\s*ambulance', r'medical\s*helicopter',
-                r'aviation\s*ambulance', r'air\s*medical\s*transport', r'emergency\s*aviation',
-                r'medical\s*aviation', r'flight\s*ambulance', r'aerial\s*ambulance',
-                r'medical\s*flight', r'emergency\s*helicopter', r'air\s*medical\s*service',
-                r'helicopter\s*medical\s*service', r'aeromedical\s*transport',
-                r'medical\s*evacuation', r'air\s*evacuation', r'emergency\s*air\s*transport'
-            ],
-            
-            # Distance and Travel Clauses (NEW)
-            'distance_travel': [
-                r'distance', r'travel\s*distance', r'kilometer', r'kilometre', r'km',
-                r'\d+\s*km', r'\d+\s*kilometer', r'maximum\s*distance', r'travel\s*limit',
-                r'distance\s*limit', r'coverage\s*distance', r'service\s*range',
-                r'operational\s*range', r'travel\s*range', r'150\s*km', r'one\s*hundred\s*fifty'
-            ],
-            
-            # Well Mother/Baby Clauses (NEW - Critical)
-            'well_mother': [
-                r'well\s*mother', r'mother\s*wellness', r'maternal\s*wellness',
-                r'expectant\s*mother\s*care', r'pregnancy\s*wellness', r'maternal\s*health',
-                r'mother\s*care', r'maternal\s*care', r'well\s*mother\s*cover',
-                r'well\s*mother\s*benefits', r'mother\s*wellness\s*program'
-            ],
-            
-            'well_baby': [
-                r'well\s*baby', r'baby\s*wellness', r'infant\s*wellness', r'newborn\s*care',
-                r'baby\s*care', r'infant\s*care', r'neonatal\s*care', r'baby\s*health',
-                r'infant\s*health', r'newborn\s*wellness', r'well\s*baby\s*expenses',
-                r'healthy\s*baby', r'baby\s*medical\s*care', r'infant\s*medical\s*care'
-            ],
-            
-            # Routine Care Clauses (NEW)
-            'routine_care': [
-                r'routine\s*medical\s*care', r'routine\s*care', r'preventive\s*care',
-                r'wellness\s*care', r'health\s*maintenance', r'regular\s*checkup',
-                r'routine\s*checkup', r'standard\s*care', r'basic\s*medical\s*care',
-                r'health\s*screening', r'wellness\s*services', r'preventive\s*medicine'
-            ],
-            
-            # UIN and Regulatory Clauses (NEW - Critical)
-            'regulatory': [
-                r'UIN', r'unique\s*identification\s*number', r'product\s*identification',
-                r'regulatory\s*number', r'approval\s*number', r'license\s*number',
-                r'registration\s*number', r'product\s*code', r'policy\s*code',
-                r'base\s*product', r'add[\-\s]?on', r'rider', r'endorsement',
-                r'competent\s*authority', r'government\s*authority', r'regulatory\s*authority'
-            ],
-            
-            # Licensing and Certification Clauses (NEW)
-            'licensing': [
-                r'licensed', r'certified', r'authorized', r'approved', r'accredited',
-                r'registered', r'qualified', r'permitted', r'duly\s*licensed',
-                r'competent\s*government\s*authority', r'licensing\s*authority',
-                r'regulatory\s*body', r'certification\s*authority', r'official\s*authority'
-            ],
-            
-            # Table and Benefits Clauses (NEW)
-            'table_benefits': [
-                r'table\s*of\s*benefits', r'benefit\s*table', r'coverage\s*table',
-                r'benefit\s*schedule', r'coverage\s*schedule', r'policy\s*schedule',
-                r'benefits\s*chart', r'coverage\s*chart', r'benefit\s*summary',
-                r'coverage\s*summary', r'schedule\s*of\s*benefits'
-            ],
-            
-            # Multiple Birth Clauses (NEW)
-            'multiple_birth': [
-                r'multiple\s*birth', r'multiple\s*babies', r'twins', r'triplets',
-                r'quadruplets', r'multiple\s*children', r'multiple\s*newborn',
-                r'twin\s*birth', r'multiple\s*deliveries', r'simultaneous\s*birth'
-            ],
-            
-            # Proportionate Payment Clauses (NEW)
-            'proportionate_payment': [
-                r'proportionate', r'proportional', r'pro[\-\s]?rata', r'partial\s*payment',
-                r'reduced\s*payment', r'scaled\s*payment', r'adjusted\s*payment',
-                r'calculated\s*payment', r'percentage\s*payment', r'ratio[\-\s]?based'
-            ],
-            
-            # Period Options Clauses (NEW)
-            'period_options': [
-                r'period\s*option', r'coverage\s*period', r'policy\s*period',
-                r'benefit\s*period', r'three\s*period', r'multiple\s*period',
-                r'period\s*choice', r'coverage\s*option', r'benefit\s*option'
-            ],
-            
-            # Medical Examination Clauses (NEW)
-            'medical_examination': [
-                r'medical\s*examination', r'health\s*checkup', r'medical\s*checkup',
-                r'customary\s*examination', r'routine\s*examination', r'health\s*assessment',
-                r'medical\s*assessment', r'clinical\s*examination', r'physical\s*examination',
-                r'diagnostic\s*examination', r'screening\s*examination'
-            ],
-            
-            # Sum Insured and Limits (Enhanced)
-            'sum_insured_limits': [
-                r'sum\s*insured', r'insured\s*amount', r'coverage\s*amount', r'policy\s*limit',
-                r'maximum\s*coverage', r'benefit\s*limit', r'coverage\s*limit',
-                r'insurance\s*limit', r'maximum\s*benefit', r'benefit\s*amount',
-                r'room\s*rent\s*limit', r'ICU\s*limit', r'sub[\-\s]?limit', r'1%\s*of\s*SI',
-                r'2%\s*of\s*SI', r'percentage\s*of\s*sum\s*insured'
-            ],
-            
-            # Plan Types (Enhanced)
-            'plan_types': [
-                r'plan\s*A', r'plan\s*B', r'plan\s*C', r'basic\s*plan', r'standard\s*plan',
-                r'premium\s*plan', r'option\s*A', r'option\s*B', r'package\s*A',
-                r'package\s*B', r'scheme\s*A', r'scheme\s*B', r'variant\s*A'
-            ],
-            
-            # AYUSH Treatment (Enhanced)
-            'ayush_treatment': [
-                r'AYUSH', r'ayurveda', r'yoga', r'naturopathy', r'unani', r'siddha',
-                r'homeopathy', r'alternative\s*medicine', r'traditional\s*medicine',
-                r'ayurvedic\s*treatment', r'homeopathic\s*treatment', r'natural\s*medicine',
-                r'AYUSH\s*hospital', r'AYUSH\s*treatment', r'ayurvedic\s*hospital'
-            ],
-            
-            # Hospital Definition (Enhanced)
-            'hospital_definition': [
-                r'hospital', r'medical\s*institution', r'healthcare\s*facility',
-                r'nursing\s*home', r'medical\s*center', r'clinic', r'healthcare\s*center',
-                r'\d+\s*bed', r'minimum\s*bed', r'inpatient\s*bed', r'qualified\s*nursing',
-                r'operation\s*theatre', r'medical\s*practitioner', r'24\s*hours?',
-                r'round\s*the\s*clock', r'full\s*time'
-            ]
-        }
-        
-        # Enhanced relationship mapping for insurance clauses
-        self.clause_relationships = {
-            'dependencies': {
-                'waiting_period': ['coverage', 'pre_existing', 'maternity'],
-                'grace_period': ['premium'],  
-                'maternity': ['waiting_period', 'coverage'],
-                'well_mother': ['maternity', 'routine_care'],
-                'well_baby': ['maternity', 'routine_care'],
-                'air_ambulance': ['licensing', 'distance_travel', 'table_benefits'],
-                'proportionate_payment': ['distance_travel', 'air_ambulance'],
-                'regulatory': ['licensing', 'table_benefits']
-            },
-            'conflicts': {
-                'coverage': ['exclusion'],
-                'benefits': ['exclusion'],
-                'air_ambulance': ['exclusion'],
-                'well_mother': ['exclusion'],
-                'well_baby': ['exclusion']
-            },
-            'related': {
-                'waiting_period': ['pre_existing', 'coverage'],
-                'maternity': ['well_mother', 'well_baby'],
-                'air_ambulance': ['distance_travel', 'proportionate_payment'],
-                'regulatory': ['licensing', 'table_benefits'],
-                'routine_care': ['well_mother', 'well_baby']
-            }
-        }
-        
-        # Enhanced scoring weights for different clause types
-        self.clause_weights = {
-            'air_ambulance': 1.5,          # High priority for test document
-            'well_mother': 1.4,            # High priority for test document  
-            'well_baby': 1.4,              # High priority for test document
-            'regulatory': 1.3,             # Important for UIN queries
-            'distance_travel': 1.3,        # Important for air ambulance queries
-            'proportionate_payment': 1.2,  # Important for calculation queries
-            'waiting_period': 1.1,         # Standard insurance clause
-            'grace_period': 1.1,           # Standard insurance clause
-            'maternity': 1.1,              # Standard insurance clause
-            'pre_existing': 1.1,           # Standard insurance clause
-            'coverage': 1.0,               # Base weight
-            'exclusion': 1.0,              # Base weight
-            'premium': 1.0,                # Base weight
-            'deductible': 1.0              # Base weight
-        }
+        # Shared, import-time pattern tables; every matcher uses the same objects
+        self.clause_patterns = CLAUSE_PATTERNS
+        self.clause_relationships = CLAUSE_RELATIONSHIPS
+        self.clause_weights = CLAUSE_WEIGHTS
+        self.scanner = CLAUSE_SCANNER
         
         logger.info("Initialized ENHANCED clause matcher with comprehensive insurance patterns")
     
@@ -311,48 +736,65 @@ class ClauseMatcher:
             # Multi-type clause identification
             clause_types = self._identify_clause_types_comprehensive(query)
             
-            # Calculate similarities and pattern matches
-            matches = []
-            for chunk in document_chunks:
-                chunk_text = chunk.get('text', '')
-                similarity = chunk.get('score', 0.0)
-                
-                if similarity >= threshold:
-                    # Enhanced confidence calculation
-                    confidence_data = self._calculate_enhanced_confidence(
-                        query, chunk_text, similarity, clause_types
-                    )
-                    
-                    match = ClauseMatch(
-                        text=chunk_text,
-                        similarity_score=similarity,
-                        document_id=chunk.get('document_id', ''),
-                        chunk_index=chunk.get('chunk_index', 0),
-                        clause_type=confidence_data['primary_type'],
-                        confidence=confidence_data['confidence'],
-                        metadata=chunk.get('metadata', {}),
-                        pattern_matches=confidence_data['pattern_matches'],
-                        keyword_density=confidence_data['keyword_density'],
-                        context_relevance=confidence_data['context_relevance'],
-                        regulatory_score=confidence_data['regulatory_score']
-                    )
-                    matches.append(match)
+            # Only chunks above the similarity threshold are scored
+            similarities = np.fromiter(
+                (chunk.get('score', 0.0) for chunk in document_chunks),
+                dtype=np.float64,
+                count=len(document_chunks)
+            )
+            selected = np.flatnonzero(similarities >= threshold)
+            if selected.size == 0:
+                return []
+            
+            # Overlapping windows and repeated boilerplate are only scored once
+            if DATASKETCH_AVAILABLE and selected.size > DEDUP_MIN_CHUNKS:
+                selected = _deduplicate_chunks(document_chunks, selected, similarities)
             
-            # Enhanced sorting with multiple criteria
-            matches.sort(
-                key=lambda x: (
-                    x.confidence,
-                    x.similarity_score,
-                    x.keyword_density,
-                    x.regulatory_score
-                ), 
-                reverse=True
+            # Active weights and regexes are resolved once for all chunks
+            scan_plan = _scan_plan(tuple(clause_types))
+            
+            # Scoring is CPU-bound; run it off the event loop
+            selected_chunks = [document_chunks[i] for i in selected]
+            scores = await asyncio.to_thread(
+                self._score_chunks,
+                query,
+                [chunk.get('text', '') for chunk in selected_chunks],
+                similarities[selected],
+                scan_plan
             )
             
+            primary_type = clause_types[0] if clause_types else 'general'
+            matches = [
+                ClauseMatch(
+                    text=chunk.get('text', ''),
+                    similarity_score=float(similarity),
+                    document_id=chunk.get('document_id', ''),
+                    chunk_index=chunk.get('chunk_index', 0),
+                    clause_type=primary_type,
+                    confidence=float(confidence),
+                    metadata=chunk.get('metadata', {}),
+                    pattern_matches=pattern_matches,
+                    keyword_density=float(keyword_density),
+                    context_relevance=float(context_relevance),
+                    regulatory_score=float(regulatory_score)
+                )
+                for chunk, similarity, confidence, pattern_matches,
+                    keyword_density, context_relevance, regulatory_score in zip(
+                    selected_chunks,
+                    similarities[selected],
+                    scores['confidence'],
+                    scores['pattern_matches'],
+                    scores['keyword_density'],
+                    scores['context_relevance'],
+                    scores['regulatory_score']
+                )
+            ]
+            
             # Apply enhanced filtering
             filtered_matches = self._apply_enhanced_filtering(matches, clause_types)
             
-            result = filtered_matches[:max_matches]
+            # Top matches by multiple criteria, without sorting the whole list
+            result = heapq.nlargest(max_matches, filtered_matches, key=MATCH_RANK_KEY)
             logger.info(f"Found {len(result)} relevant clauses with enhanced matching")
             
             return result
@@ -363,296 +805,199 @@ class ClauseMatcher:
     
     def _identify_clause_types_comprehensive(self, query: str) -> List[str]:
         """Enhanced clause type identification supporting multiple types."""
-        query_lower = query.lower()
-        identified_types = []
-        
-        # Check against all patterns with priority scoring
-        type_scores = {}
-        
-        for clause_type, patterns in self.clause_patterns.items():
-            score = 0
-            matched_patterns = []
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, query_lower)
-                if matches:
-                    score += len(matches)
-                    matched_patterns.extend(matches)
-            
-            if score > 0:
-                # Apply clause weight multiplier
-                weighted_score = score * self.clause_weights.get(clause_type, 1.0)
-                type_scores[clause_type] = {
-                    'score': weighted_score,
-                    'matches': matched_patterns
-                }
-        
-        # Sort by weighted score and return top types
-        sorted_types = sorted(
-            type_scores.items(), 
-            key=lambda x: x[1]['score'], 
-            reverse=True
-        )
-        
-        # Return top 3 clause types or all if less than 3
-        identified_types = [t[0] for t in sorted_types[:3]]
-        
-        # Default to general if no specific types identified
-        if not identified_types:
-            identified_types = ['general']
+        identified_types = list(_identify_clause_types(query))
         
         logger.debug(f"Identified clause types: {identified_types}")
         return identified_types
     
-    def _calculate_enhanced_confidence(
+    def _score_chunks(
         self, 
         query: str, 
-        text: str, 
-        similarity: float,
-        clause_types: List[str]
+        texts: List[str], 
+        similarities: np.ndarray,
+        scan_plan: ClauseScanPlan
     ) -> Dict:
-        """Enhanced confidence calculation with comprehensive scoring."""
-        base_confidence = similarity
+        """
+        Score a batch of chunks at once.
         
-        # Pattern matching analysis
-        pattern_data = self._analyze_pattern_matches(text, clause_types)
-        pattern_boost = pattern_data['boost']
-        pattern_matches = pattern_data['matches']
+        Text features are gathered per chunk, then all of them are combined
+        into the final confidences with array arithmetic.
         
-        # Keyword density analysis
-        keyword_density = self._calculate_keyword_density(query, text)
+        Returns:
+            Dict of per-chunk score arrays, aligned with texts
+        """
+        k = len(scan_plan.clause_types)
+        boost_weights = scan_plan.boost_weights
+        query_terms = self._prepare_query_terms(query)
         
-        # Context relevance analysis
-        context_relevance = self._calculate_context_relevance(text, clause_types)
+        features, pattern_matches, word_counts = _extract_chunk_features(texts, scan_plan)
         
-        # Regulatory/technical content analysis
-        regulatory_score = self._calculate_regulatory_score(text)
+        pattern_counts = features[:, :k]
+        context_counts = features[:, k:2 * k]
+        high_counts, medium_counts = features[:, 2 * k:].T
         
-        # Length and completeness analysis
-        length_boost = self._calculate_length_boost(text)
+        # Each clause type contributes at most 0.3, the total at most 0.5
+        pattern_boost = np.minimum(
+            0.5, np.minimum(0.3, pattern_counts * boost_weights).sum(axis=1)
+        )
+        context_relevance = np.minimum(
+            1.0, np.minimum(0.3, context_counts * boost_weights).sum(axis=1)
+        )
+        insurance_boost = np.minimum(0.3, high_counts * 0.05 + medium_counts * 0.02)
+        regulatory_score = np.fromiter(map(_regulatory_score, texts), dtype=np.float64, count=len(texts))
+        
+        # Favour medium-to-long chunks, penalise very short ones
+        length_boost = LENGTH_BOOSTS[np.digitize(word_counts, LENGTH_BINS)]
         
-        # Insurance-specific term analysis
-        insurance_boost = self._calculate_insurance_boost(text, clause_types)
+        keyword_density = np.fromiter(
+            (self._keyword_density(query_terms, text) for text in texts),
+            dtype=np.float64,
+            count=len(texts)
+        )
         
         # Combine all factors with sophisticated weighting
-        total_confidence = min(1.0, 
-            base_confidence * 0.4 +           # Base similarity (40%)
-            pattern_boost * 0.25 +            # Pattern matching (25%)
-            keyword_density * 0.15 +          # Keyword density (15%)
-            context_relevance * 0.1 +         # Context relevance (10%)
-            length_boost * 0.05 +             # Length boost (5%)
-            insurance_boost * 0.05            # Insurance terms (5%)
+        confidence = _confidence(
+            similarities, pattern_boost, keyword_density,
+            context_relevance, length_boost, insurance_boost
         )
         
         return {
-            'confidence': total_confidence,
-            'primary_type': clause_types[0] if clause_types else 'general',
+            'confidence': confidence,
             'pattern_matches': pattern_matches,
             'keyword_density': keyword_density,
             'context_relevance': context_relevance,
             'regulatory_score': regulatory_score
         }
     
-    def _analyze_pattern_matches(self, text: str, clause_types: List[str]) -> Dict:
-        """Analyze pattern matches across multiple clause types."""
-        text_lower = text.lower()
-        total_boost = 0.0
-        all_matches = []
-        
-        for clause_type in clause_types:
-            if clause_type == 'general':
-                continue
-                
-            patterns = self.clause_patterns.get(clause_type, [])
-            clause_matches = []
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, text_lower)
-                if matches:
-                    clause_matches.extend(matches)
-            
-            if clause_matches:
-                # Calculate boost based on matches and clause weight
-                clause_weight = self.clause_weights.get(clause_type, 1.0)
-                clause_boost = min(0.3, len(clause_matches) * 0.1 * clause_weight)
-                total_boost += clause_boost
-                all_matches.extend(clause_matches)
-        
-        return {
-            'boost': min(0.5, total_boost),  # Cap total boost at 0.5
-            'matches': list(set(all_matches))  # Remove duplicates
-        }
+    def _prepare_query_terms(self, query: str) -> QueryTerms:
+        """Normalize a query once into the pieces keyword density needs."""
+        return _query_terms(query)
     
     def _calculate_keyword_density(self, query: str, text: str) -> float:
         """Calculate keyword density with enhanced analysis."""
-        query_words = set(normalize_text(query).split())
-        text_words = set(normalize_text(text).split())
-        
-        # Enhanced stop words removal
-        stop_words = {
-            'the', 'is', 'are', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 
-            'for', 'of', 'with', 'by', 'from', 'as', 'an', 'a', 'this', 'that',
-            'these', 'those', 'be', 'been', 'being', 'have', 'has', 'had',
-            'do', 'does', 'did', 'will', 'would', 'should', 'could', 'can'
-        }
+        return self._keyword_density(_query_terms(query), text)
+    
+    @staticmethod
+    def _keyword_density(query_terms: QueryTerms, text: str) -> float:
+        """Calculate keyword density against a pre-normalized query, remembered across calls."""
+        if not query_terms.words:
+            return 0.0
         
-        query_words -= stop_words
-        text_words -= stop_words
+        # Every query term derives from the normalized query text
+        key = (query_terms.text, _text_digest(text))
+        density = _keyword_densities.get(key)
+        if density is None:
+            density = ClauseMatcher._compute_keyword_density(query_terms, text)
+            _keyword_densities.put(key, density)
+        return density
+    
+    @staticmethod
+    def _compute_keyword_density(query_terms: QueryTerms, text: str) -> float:
+        """Calculate keyword density for a query with at least one non-stop word."""
+        text_normalized = normalize_text(text)
         
-        if not query_words:
-            return 0.0
+        if query_terms.automaton is not None:
+            words_found, phrases_found, has_text = ClauseMatcher._scan_query_terms(
+                query_terms.automaton, text_normalized
+            )
+        else:
+            # Stop words never appear in query_terms.words, so they drop out here
+            words_found = query_terms.words & frozenset(text_normalized.split())
+            phrases_found = {phrase for phrase in query_terms.phrases if phrase in text_normalized}
+            has_text = query_terms.text in text_normalized
         
-        # Calculate various overlap metrics
-        overlap = len(query_words.intersection(text_words))
-        overlap_ratio = overlap / len(query_words)
+        overlap_ratio = len(words_found) / len(query_terms.words)
         
         # Boost for exact phrase matches
         phrase_boost = 0.0
-        query_text = normalize_text(query)
-        text_normalized = normalize_text(text)
-        
-        if query_text in text_normalized:
+        if has_text:
             phrase_boost = 0.3
-        elif len(query_text.split()) > 1:
+        elif query_terms.phrases:
             # Check for partial phrase matches
-            query_phrases = [' '.join(query_text.split()[i:i+2]) 
-                           for i in range(len(query_text.split())-1)]
-            phrase_matches = sum(1 for phrase in query_phrases if phrase in text_normalized)
+            phrase_matches = sum(1 for phrase in query_terms.phrases if phrase in phrases_found)
             phrase_boost = min(0.2, phrase_matches * 0.1)
         
         total_density = min(1.0, overlap_ratio + phrase_boost)
         return total_density
     
-    def _calculate_context_relevance(self, text: str, clause_types: List[str]) -> float:
-        """Calculate contextual relevance based on surrounding content."""
-        text_lower = text.lower()
-        relevance_score = 0.0
-        
-        # Context indicators for different clause types
-        context_indicators = {
-            'air_ambulance': ['hospital', 'emergency', 'medical', 'transport', 'evacuation'],
-            'well_mother': ['pregnancy', 'maternal', 'delivery', 'prenatal', 'postnatal'],
-            'well_baby': ['newborn', 'infant', 'baby', 'neonatal', 'pediatric'],
-            'regulatory': ['authority', 'government', 'approval', 'license', 'compliance'],
-            'waiting_period': ['months', 'years', 'continuous', 'inception', 'commencement'],
-            'grace_period': ['payment', 'premium', 'renewal', 'due', 'extension'],
-            'maternity': ['pregnancy', 'delivery', 'childbirth', 'obstetric', 'labor']
-        }
+    @staticmethod
+    def _scan_query_terms(automaton, text_normalized: str) -> Tuple[Set[str], Set[str], bool]:
+        """
+        Find query words, phrases and the full query in normalized text in one pass.
         
-        for clause_type in clause_types:
-            indicators = context_indicators.get(clause_type, [])
-            matches = sum(1 for indicator in indicators if indicator in text_lower)
-            
-            if matches > 0:
-                clause_weight = self.clause_weights.get(clause_type, 1.0)
-                type_relevance = min(0.3, matches * 0.1 * clause_weight)
-                relevance_score += type_relevance
+        Words must match whole tokens; phrases and the full query match anywhere.
         
-        return min(1.0, relevance_score)
-    
-    def _calculate_regulatory_score(self, text: str) -> float:
-        """Calculate score for regulatory/technical content."""
-        text_upper = text.upper()
-        regulatory_score = 0.0
-        
-        # Regulatory patterns
-        regulatory_patterns = [
-            r'\b[A-Z]{2,}[0-9]{2,}[A-Z0-9]*\b',  # UIN patterns
-            r'\bUIN\b', r'\bauthority\b', r'\blicens\w*\b',
-            r'\bapproval\b', r'\bregistration\b', r'\bcompliance\b',
-            r'\bregulatory\b', r'\bgovernment\b', r'\bofficial\b'
-        ]
+        Returns:
+            Tuple of (words found, phrases found, whether the full query occurs)
+        """
+        words_found = set()
+        phrases_found = set()
+        has_text = False
+        last = len(text_normalized) - 1
         
-        for pattern in regulatory_patterns:
-            matches = len(re.findall(pattern, text_upper))
-            if matches > 0:
-                regulatory_score += matches * 0.1
-        
-        return min(1.0, regulatory_score)
-    
-    def _calculate_length_boost(self, text: str) -> float:
-        """Enhanced length-based confidence boost."""
-        word_count = len(text.split())
-        sentence_count = len(extract_sentences(text))
-        
-        # Optimal length scoring
-        if word_count < 15:
-            return -0.1  # Penalty for very short text
-        elif 15 <= word_count <= 30:
-            return 0.0   # Neutral for short text
-        elif 30 <= word_count <= 100:
-            return 0.1   # Boost for medium text
-        elif 100 <= word_count <= 200:
-            return 0.15  # Good boost for comprehensive text
-        else:
-            return 0.1   # Slight reduction for very long text
-    
-    def _calculate_insurance_boost(self, text: str, clause_types: List[str]) -> float:
-        """Calculate boost for insurance-specific terminology."""
-        text_lower = text.lower()
-        insurance_boost = 0.0
-        
-        # High-value insurance terms
-        high_value_terms = [
-            'sum insured', 'policy limit', 'coverage amount', 'benefit limit',
-            'waiting period', 'grace period', 'pre-existing', 'maternity',
-            'air ambulance', 'well mother', 'well baby', 'proportionate',
-            'licensed authority', 'competent authority', 'table of benefits'
-        ]
+        for end, (term, kinds) in automaton.iter(text_normalized):
+            if QUERY_WORD in kinds:
+                # normalize_text leaves single spaces between tokens
+                start = end - len(term) + 1
+                if (start == 0 or text_normalized[start - 1] == ' ') and \
+                        (end == last or text_normalized[end + 1] == ' '):
+                    words_found.add(term)
+            if QUERY_PHRASE in kinds:
+                phrases_found.add(term)
+            if QUERY_TEXT in kinds:
+                has_text = True
         
-        # Medium-value insurance terms
-        medium_value_terms = [
-            'premium', 'deductible', 'co-pay', 'exclusion', 'coverage',
-            'benefit', 'treatment', 'hospitalization', 'medical expenses',
-            'reimbursement', 'indemnity', 'compensation'
-        ]
+        return words_found, phrases_found, has_text
+    
+    @staticmethod
+    def _scan_all(text: str, plan: ClauseScanPlan) -> Tuple[np.ndarray, Tuple[int, ...]]:
+        """
+        Collect every text feature of a chunk in one scan.
         
-        # Count high-value terms
-        high_matches = sum(1 for term in high_value_terms if term in text_lower)
-        insurance_boost += high_matches * 0.05
+        Returns:
+            Tuple of (feature vector, distinct matched pattern IDs). The vector holds
+            pattern counts per clause type, context indicator counts per clause
+            type, then high-value and medium-value term counts.
+        """
+        k = len(plan.clause_types)
+        vector = np.zeros(2 * k + 2, dtype=np.int32)
+        matches, present = CLAUSE_SCANNER.scan_features(text, plan)
         
-        # Count medium-value terms
-        medium_matches = sum(1 for term in medium_value_terms if term in text_lower)
-        insurance_boost += medium_matches * 0.02
+        chunk_matches = set()
+        for i, clause_type in enumerate(plan.clause_types):
+            clause_matches = matches.get(clause_type)
+            if clause_matches:
+                vector[i] = len(clause_matches)
+                chunk_matches.update(clause_matches)
+            vector[k + i] = len(present.get((CONTEXT_FEATURE, clause_type), ()))
         
-        return min(0.3, insurance_boost)
+        vector[2 * k] = len(present.get((HIGH_VALUE_FEATURE, ''), ()))
+        vector[2 * k + 1] = len(present.get((MEDIUM_VALUE_FEATURE, ''), ()))
+        return vector, tuple(chunk_matches)
+    
+    def _calculate_regulatory_score(self, text: str) -> float:
+        """Calculate score for regulatory/technical content."""
+        return _regulatory_score(text)
     
     def _apply_enhanced_filtering(self, matches: List[ClauseMatch], clause_types: List[str]) -> List[ClauseMatch]:
         """Apply enhanced filtering with multiple criteria."""
         if not clause_types or clause_types == ['general']:
             return matches
         
-        filtered_matches = []
-        
-        for match in matches:
-            should_include = False
-            
-            # Include if high similarity regardless of patterns
-            if match.similarity_score > 0.8:
-                should_include = True
-            
-            # Include if high confidence score
-            elif match.confidence > 0.7:
-                should_include = True
-            
-            # Include if has relevant pattern matches
-            elif match.pattern_matches:
-                should_include = True
-            
-            # Include if high keyword density
-            elif match.keyword_density > 0.5:
-                should_include = True
-            
-            # Include if high regulatory score (for UIN queries)
-            elif match.regulatory_score > 0.3:
-                should_include = True
-            
-            if should_include:
-                filtered_matches.append(match)
+        # Any one criterion is enough; the cheapest, most often true checks
+        # come first so most matches are decided by a tuple truthiness test
+        filtered_matches = [
+            match for match in matches
+            if match.pattern_matches               # Has relevant pattern matches
+            or match.similarity_score > 0.8        # High similarity regardless of patterns
+            or match.confidence > 0.7              # High confidence score
+            or match.keyword_density > 0.5         # High keyword density
+            or match.regulatory_score > 0.3        # High regulatory score (for UIN queries)
+        ]
         
         # If filtering is too restrictive, return top matches anyway
         if len(filtered_matches) < 3 and len(matches) > 3:
-            return matches[:8]
+            return heapq.nlargest(8, matches, key=MATCH_RANK_KEY)
         
         return filtered_matches
     
@@ -662,64 +1007,94 @@ class ClauseMatcher:
         clause_types: List[str]
     ) -> Dict[str, List[ClauseMatch]]:
         """Enhanced clause extraction with comprehensive analysis."""
+        # Scanning and scoring are CPU-bound; run them off the event loop
+        return await asyncio.to_thread(self._extract_specific_clauses, document_chunks, clause_types)
+    
+    def _extract_specific_clauses(
+        self, 
+        document_chunks: List[Dict], 
+        clause_types: List[str]
+    ) -> Dict[str, List[ClauseMatch]]:
+        """
+        Extract the top matches for each clause type from a batch of chunks.
+        
+        Each chunk is scanned once for the patterns of all requested clause
+        types. Each clause type then scores all chunks with array arithmetic,
+        and ClauseMatch objects are only built for chunks with at least one
+        pattern match.
+        """
         results = {}
         
+        # Interned so later lookups by clause type (weights, relationship tables,
+        # grouping) hit the identity fast path against the table keys
+        clause_types = [sys.intern(clause_type) for clause_type in clause_types]
+        
+        texts = [chunk.get('text', '') for chunk in document_chunks]
+        base_scores = np.fromiter(
+            (chunk.get('score', 0.5) for chunk in document_chunks),
+            dtype=np.float64,
+            count=len(document_chunks)
+        )
+        
+        # One scan per chunk tags every hit with the clause type it belongs to
+        known_types = tuple(dict.fromkeys(
+            clause_type for clause_type in clause_types if clause_type in self.clause_patterns
+        ))
+        chunk_scans = []
+        if known_types:
+            scan_plan = _scan_plan(known_types)
+            chunk_scans = _scan_chunks(texts, scan_plan)
+        
         for clause_type in clause_types:
             logger.info(f"Extracting {clause_type} clauses with enhanced analysis")
             
-            patterns = self.clause_patterns.get(clause_type, [])
-            if not patterns:
+            if clause_type not in self.clause_patterns:
                 results[clause_type] = []
                 continue
             
-            matches = []
-            for chunk in document_chunks:
-                text = chunk.get('text', '')
-                text_lower = text.lower()
-                
-                # Enhanced pattern matching
-                pattern_score = 0
-                matched_patterns = []
-                
-                for pattern in patterns:
-                    pattern_matches = re.findall(pattern, text_lower)
-                    if pattern_matches:
-                        pattern_score += len(pattern_matches)
-                        matched_patterns.extend(pattern_matches)
-                
-                if pattern_score > 0:
-                    # Enhanced confidence calculation
-                    base_score = chunk.get('score', 0.5)
-                    clause_weight = self.clause_weights.get(clause_type, 1.0)
-                    
-                    # Calculate comprehensive confidence
-                    confidence = min(1.0, 
-                        base_score * 0.4 +
-                        min(0.4, pattern_score * 0.1) * clause_weight +
-                        self._calculate_keyword_density(clause_type, text) * 0.2
-                    )
-                    
-                    match = ClauseMatch(
-                        text=text,
-                        similarity_score=base_score,
-                        document_id=chunk.get('document_id', ''),
-                        chunk_index=chunk.get('chunk_index', 0),
-                        clause_type=clause_type,
-                        confidence=confidence,
-                        metadata=chunk.get('metadata', {}),
-                        pattern_matches=matched_patterns,
-                        keyword_density=self._calculate_keyword_density(clause_type, text),
-                        regulatory_score=self._calculate_regulatory_score(text)
-                    )
-                    matches.append(match)
+            pattern_matches = [chunk_scan.get(clause_type, ()) for chunk_scan in chunk_scans]
+            pattern_scores = np.fromiter(
+                map(len, pattern_matches), dtype=np.int64, count=len(texts)
+            )
             
-            # Sort by comprehensive scoring
-            matches.sort(
-                key=lambda x: (x.confidence, x.similarity_score, len(x.pattern_matches)), 
-                reverse=True
+            # Only chunks with pattern matches are scored
+            selected = np.flatnonzero(pattern_scores)
+            keyword_density = np.fromiter(
+                (self._calculate_keyword_density(clause_type, texts[i]) for i in selected),
+                dtype=np.float64,
+                count=len(selected)
             )
+            clause_weight = self.clause_weights.get(clause_type, 1.0)
             
-            results[clause_type] = matches[:8]  # Increased from 5 to 8
+            # Calculate comprehensive confidence
+            confidence = _extraction_confidence(
+                base_scores[selected], pattern_scores[selected], clause_weight, keyword_density
+            )
+            
+            matches = [
+                ClauseMatch(
+                    text=texts[i],
+                    similarity_score=document_chunks[i].get('score', 0.5),
+                    document_id=document_chunks[i].get('document_id', ''),
+                    chunk_index=document_chunks[i].get('chunk_index', 0),
+                    clause_type=clause_type,
+                    confidence=float(chunk_confidence),
+                    metadata=document_chunks[i].get('metadata', {}),
+                    pattern_matches=tuple(pattern_matches[i]),
+                    keyword_density=float(chunk_keyword_density),
+                    regulatory_score=self._calculate_regulatory_score(texts[i])
+                )
+                for i, chunk_confidence, chunk_keyword_density in zip(
+                    selected.tolist(), confidence, keyword_density
+                )
+            ]
+            
+            # Top 8 by comprehensive scoring, without sorting every match
+            results[clause_type] = heapq.nlargest(
+                8,  # Increased from 5 to 8
+                matches,
+                key=EXTRACTION_RANK_KEY
+            )
         
         return results
     
@@ -734,43 +1109,38 @@ class ClauseMatcher:
         }
         
         # Group matches by type
-        by_type = {}
+        by_type: Dict[str, List[ClauseMatch]] = defaultdict(list)
         for match in matches:
-            clause_type = match.clause_type
-            if clause_type not in by_type:
-                by_type[clause_type] = []
-            by_type[clause_type].append(match)
+            by_type[match.clause_type].append(match)
+        
+        # Clause types present, checked against every relationship table
+        present = set(by_type)
         
         # Analyze dependencies
         for clause_type, deps in self.clause_relationships['dependencies'].items():
-            if clause_type in by_type:
-                for dep in deps:
-                    if dep in by_type:
-                        relationships['dependencies'].append(
-                            f"{clause_type} requires {dep} context"
-                        )
+            if clause_type in present and not present.isdisjoint(deps):
+                relationships['dependencies'].extend(
+                    f"{clause_type} requires {dep} context" for dep in deps if dep in present
+                )
         
         # Analyze conflicts
         for clause_type, conflicts in self.clause_relationships['conflicts'].items():
-            if clause_type in by_type:
-                for conflict in conflicts:
-                    if conflict in by_type:
-                        relationships['conflicts'].append(
-                            f"{clause_type} may be limited by {conflict}"
-                        )
+            if clause_type in present and not present.isdisjoint(conflicts):
+                relationships['conflicts'].extend(
+                    f"{clause_type} may be limited by {conflict}"
+                    for conflict in conflicts if conflict in present
+                )
         
         # Analyze related clauses
         for clause_type, related in self.clause_relationships['related'].items():
-            if clause_type in by_type:
-                for rel in related:
-                    if rel in by_type:
-                        relationships['related'].append(
-                            f"{clause_type} is related to {rel}"
-                        )
+            if clause_type in present and not present.isdisjoint(related):
+                relationships['related'].extend(
+                    f"{clause_type} is related to {rel}" for rel in related if rel in present
+                )
         
         # Analyze regulatory links
         regulatory_types = ['regulatory', 'licensing', 'table_benefits']
-        regulatory_present = [t for t in regulatory_types if t in by_type]
+        regulatory_present = [t for t in regulatory_types if t in present]
         
         if len(regulatory_present) > 1:
             relationships['regulatory_links'] = [
@@ -779,7 +1149,7 @@ class ClauseMatcher:
         
         # Analyze coverage interactions
         coverage_types = ['coverage', 'air_ambulance', 'well_mother', 'well_baby', 'maternity']
-        coverage_present = [t for t in coverage_types if t in by_type]
+        coverage_present = [t for t in coverage_types if t in present]
         
         if len(coverage_present) > 1:
             relationships['coverage_interactions'] = [
@@ -793,21 +1163,166 @@ class ClauseMatcher:
         if not matches:
             return {}
         
+        # Gather every statistic in a single pass over the matches
+        confidence_sum = similarity_sum = 0.0
+        high_confidence = pattern_coverage = regulatory_detected = 0
+        distribution: Counter = Counter()
+        
+        for match in matches:
+            confidence_sum += match.confidence
+            similarity_sum += match.similarity_score
+            high_confidence += match.confidence > 0.8
+            pattern_coverage += bool(match.pattern_matches)
+            regulatory_detected += match.regulatory_score > 0.3
+            distribution[match.clause_type] += 1
+        
         stats = {
             'total_matches': len(matches),
-            'average_confidence': sum(m.confidence for m in matches) / len(matches),
-            'average_similarity': sum(m.similarity_score for m in matches) / len(matches),
-            'clause_type_distribution': {},
-            'high_confidence_matches': len([m for m in matches if m.confidence > 0.8]),
-            'pattern_match_coverage': len([m for m in matches if m.pattern_matches]),
-            'regulatory_content_detected': len([m for m in matches if m.regulatory_score > 0.3])
+            'average_confidence': confidence_sum / len(matches),
+            'average_similarity': similarity_sum / len(matches),
+            'clause_type_distribution': dict(distribution),
+            'high_confidence_matches': high_confidence,
+            'pattern_match_coverage': pattern_coverage,
+            'regulatory_content_detected': regulatory_detected
         }
         
-        # Calculate clause type distribution
-        for match in matches:
-            clause_type = match.clause_type
-            if clause_type not in stats['clause_type_distribution']:
-                stats['clause_type_distribution'][clause_type] = 0
-            stats['clause_type_distribution'][clause_type] += 1
-        
         return stats
+
+def _extract_chunk_features(
+    texts: List[str], 
+    scan_plan: ClauseScanPlan
+) -> Tuple[np.ndarray, List[Tuple[int, ...]], np.ndarray]:
+    """
+    Gather the raw text features for a batch of chunks.
+    
+    Returns:
+        Tuple of (feature matrix, pattern matches per chunk, word counts)
+    """
+    n = len(texts)
+    features = np.empty((n, 2 * len(scan_plan.clause_types) + 2), dtype=np.int32)
+    pattern_matches = []
+    word_counts = np.empty(n, dtype=np.int64)
+    
+    for i, text in enumerate(texts):
+        features[i], chunk_matches = ClauseMatcher._scan_all(text, scan_plan)
+        pattern_matches.append(chunk_matches)
+        word_counts[i] = len(text.split())
+    
+    return features, pattern_matches, word_counts
+
+def _deduplicate_chunks(
+    document_chunks: List[Dict], 
+    selected: np.ndarray, 
+    similarities: np.ndarray
+) -> np.ndarray:
+    """
+    Collapse near-duplicate chunks to one representative each.
+    
+    Chunks are visited from most to least similar and indexed in a MinHash
+    LSH over word 3-gram shingles; a chunk whose estimated Jaccard similarity
+    to an already kept chunk reaches DEDUP_THRESHOLD is dropped, so every
+    group of near-duplicates is represented by its best-scoring chunk.
+    
+    Returns:
+        The kept chunk indices, in their original order
+    """
+    lsh = MinHashLSH(threshold=DEDUP_THRESHOLD, num_perm=DEDUP_NUM_PERM)
+    kept = []
+    
+    for i in selected[np.argsort(-similarities[selected], kind='stable')]:
+        tokens = normalize_text(document_chunks[i].get('text', '')).split()
+        shingles = {
+            ' '.join(tokens[j:j + DEDUP_SHINGLE_SIZE]).encode('utf-8')
+            for j in range(max(1, len(tokens) - DEDUP_SHINGLE_SIZE + 1))
+        }
+        minhash = MinHash(num_perm=DEDUP_NUM_PERM)
+        minhash.update_batch(shingles)
+        
+        if lsh.query(minhash):
+            continue
+        lsh.insert(int(i), minhash)
+        kept.append(i)
+    
+    if len(kept) < selected.size:
+        logger.debug(f"Collapsed {selected.size - len(kept)} near-duplicate chunks before scoring")
+    return np.sort(np.array(kept, dtype=selected.dtype))
+
+def _scan_chunks(texts: List[str], scan_plan: ClauseScanPlan) -> List[Dict[str, List[int]]]:
+    """Find the IDs of matching patterns, by clause type, for a batch of chunks."""
+    return [dict(CLAUSE_SCANNER.scan(text, scan_plan)) for text in texts]
+
+def _confidence_numpy(
+    similarities: np.ndarray,
+    pattern_boost: np.ndarray,
+    keyword_density: np.ndarray,
+    context_relevance: np.ndarray,
+    length_boost: np.ndarray,
+    insurance_boost: np.ndarray
+) -> np.ndarray:
+    """Weighted confidence of every chunk."""
+    return np.minimum(1.0,
+        similarities * 0.4 +              # Base similarity (40%)
+        pattern_boost * 0.25 +            # Pattern matching (25%)
+        keyword_density * 0.15 +          # Keyword density (15%)
+        context_relevance * 0.1 +         # Context relevance (10%)
+        length_boost * 0.05 +             # Length boost (5%)
+        insurance_boost * 0.05            # Insurance terms (5%)
+    )
+
+if NUMBA_AVAILABLE:
+    # Compiled eagerly at import (and cached on disk) so no request pays for the JIT.
+    # Serial on purpose: a batch is a few dozen chunks, too few for Numba's
+    # parallel thread pool to pay for itself.
+    @njit(
+        'float64[:](float64[:], float64[:], float64[:], float64[:], float64[:], float64[:])',
+        cache=True
+    )
+    def _confidence_numba(
+        similarities, pattern_boost, keyword_density, context_relevance, length_boost, insurance_boost
+    ):
+        """Native-code version of _confidence_numpy."""
+        confidence = np.empty(similarities.shape[0])
+        for i in range(similarities.shape[0]):
+            confidence[i] = min(1.0,
+                similarities[i] * 0.4 +
+                pattern_boost[i] * 0.25 +
+                keyword_density[i] * 0.15 +
+                context_relevance[i] * 0.1 +
+                length_boost[i] * 0.05 +
+                insurance_boost[i] * 0.05
+            )
+        return confidence
+    
+    _confidence = _confidence_numba
+else:
+    _confidence = _confidence_numpy
+
+def _extraction_confidence_numpy(
+    base_scores: np.ndarray,
+    pattern_scores: np.ndarray,
+    clause_weight: float,
+    keyword_density: np.ndarray
+) -> np.ndarray:
+    """Confidence of every chunk extracted for one clause type."""
+    return np.minimum(1.0,
+        base_scores * 0.4 +
+        np.minimum(0.4, pattern_scores * 0.1) * clause_weight +
+        keyword_density * 0.2
+    )
+
+if NUMBA_AVAILABLE:
+    @njit('float64[:](float64[:], int64[:], float64, float64[:])', cache=True)
+    def _extraction_confidence_numba(base_scores, pattern_scores, clause_weight, keyword_density):
+        """Native-code version of _extraction_confidence_numpy."""
+        confidence = np.empty(base_scores.shape[0])
+        for i in range(base_scores.shape[0]):
+            confidence[i] = min(1.0,
+                base_scores[i] * 0.4 +
+                min(0.4, pattern_scores[i] * 0.1) * clause_weight +
+                keyword_density[i] * 0.2
+            )
+        return confidence
+    
+    _extraction_confidence = _extraction_confidence_numba
+else:
+    _extraction_confidence = _extraction_confidence_numpy
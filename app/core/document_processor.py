@@ -8,8 +8,14 @@ import asyncio
 import hashlib
 import io
 import logging
+import multiprocessing
+import os
 import re
-from typing import Dict, List, Union, Set
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union, Set
 from urllib.parse import urlparse
 
 import httpx
@@ -20,12 +26,187 @@ from bs4 import BeautifulSoup
 from docx import Document as DocxDocument
 from email import message_from_bytes
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+    LexborHTMLParser = None
+
+try:
+    import fitz
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+    fitz = None
+
 from app.utils.exceptions import DocumentProcessingError
 from app.utils.text_processing import clean_text, split_text_into_chunks
 from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_TIMEOUT = httpx.Timeout(120.0, connect=30.0)
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+MAGIC_HEADER_BYTES = 8192
+
+# Patterns used on every document, compiled once
+_WHITESPACE_RUN = re.compile(r'\s+')
+_NEWLINE_RUN = re.compile(r'\n+')
+_BLANK_LINE_RUN = re.compile(r'\n\s*\n\s*\n+')
+_DIGIT_RUN = re.compile(r'\d+')
+_HYPHENATED_BREAK = re.compile(r'(\w+)-\s*\n\s*(\w+)')
+_WRAPPED_WORDS = re.compile(r'(\w+)\s*\n\s*(\w+)')
+_SPACE_BEFORE_PUNCTUATION = re.compile(r'\s+([,.;:!?])')
+_PUNCTUATION_BEFORE_CAPITAL = re.compile(r'([,.;:!?])\s*([A-Z])')
+_NUMBERED_ITEM = re.compile(r'\n\s*(\d+\.)\s*')
+_LETTERED_ITEM = re.compile(r'\n\s*([a-z]\))\s*')
+_BULLET_ITEM = re.compile(r'\n\s*([•·▪▫‣⁃])\s*')
+_BULLET_LINE = re.compile(r'\n\s*[•·▪▫‣⁃]\s*')
+_PERIOD_BEFORE_CAPITAL = re.compile(r'\.([A-Z])')
+_SECTION_BOUNDARIES = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'\n\nSECTION:\s*([^\n]+)\n\n',
+        r'\n\nSUBSECTION:\s*([^\n]+)\n\n',
+        r'\n=== .+ ===\n',
+        r'\nPAGE \d+:\n',
+        r'\n\nCLAUSE \d+\.',
+        r'\n{3,}'
+    )
+]
+
+def _deep_sizeof(value) -> int:
+    """Bytes held by a value and, for containers, by everything they hold."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_sizeof(key) + _deep_sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_deep_sizeof(item) for item in value)
+    return size
+
+def _hash_document(data: bytes) -> Tuple[str, str]:
+    """Compute the (sha256 content key, md5 document id) hex digests of a document."""
+    return hashlib.sha256(data).hexdigest(), hashlib.md5(data).hexdigest()
+
+# Processes used to parse PDFs with pdfplumber; callers may tune this, and 0
+# parses PDFs in a thread instead
+_PDF_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Created by _get_pdf_pool on the first PDF parse
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+# Per-process parser used by _pdf_worker
+_worker_processor: Optional["DocumentProcessor"] = None
+
+# Characters re.IGNORECASE matches to an ASCII letter although str.lower() does not
+_IGNORECASE_FOLD = str.maketrans({'\u0130': 'i', '\u0131': 'i', '\u017f': 's'})
+
+# "<number> <unit>" normalizations, one scan per group instead of one per
+# unit. Each alternative is its own group, so match.lastindex selects the
+# canonical suffix. There is no trailing \b, matching the per-unit rules
+# these replace. Amount, distance and bed units stay a separate group: their
+# rules ran after the currency rules, which can match the 's' they append.
+_PERIOD_UNIT_PATTERN = r'(\d+)\s*(?:(years?)|(months?)|(days?)|(hours?)|(%|percent|per\s*cent))'
+_QUANTITY_UNIT_PATTERN = r'(\d+)\s*(?:(lakhs?)|(crores?)|(km)|(kilometer)|(kilometre)|(beds?))'
+_PERIOD_UNIT_SUFFIXES = (None, None, ' years', ' months', ' days', ' hours', '%')
+_QUANTITY_UNIT_SUFFIXES = (None, None, ' lakhs', ' crores', ' km', ' kilometers', ' kilometres', ' beds')
+
+def _canonical_period(match: 're.Match[str]') -> str:
+    """Replacement for _PERIOD_UNIT_PATTERN: the number with its canonical unit."""
+    return match.group(1) + _PERIOD_UNIT_SUFFIXES[match.lastindex]
+
+def _canonical_quantity(match: 're.Match[str]') -> str:
+    """Replacement for _QUANTITY_UNIT_PATTERN: the number with its canonical unit."""
+    return match.group(1) + _QUANTITY_UNIT_SUFFIXES[match.lastindex]
+
+def _freeze(words: Iterable[str]) -> FrozenSet[str]:
+    """Freeze a keyword set, interning each term so categories share one object."""
+    return frozenset(sys.intern(word) for word in words)
+
+def _skip_class(pattern: str, i: int) -> int:
+    """Return the index just past the character class starting at pattern[i]."""
+    i += 1
+    if pattern[i] == '^':
+        i += 1
+    if pattern[i] == ']':
+        i += 1
+    while pattern[i] != ']':
+        if pattern[i] == '\\':
+            i += 1
+        i += 1
+    return i + 1
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """
+    Find the longest literal run that every match of a regex must contain.
+    
+    Groups, classes, escapes such as \\s and optional atoms break runs; a
+    top-level alternation means no literal is required.
+    
+    Returns:
+        The run lowercased, for a case-insensitive pattern, or None
+    """
+    runs = []
+    run = ''
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        literal = None
+        if char == '|':
+            return None
+        if char == '\\':
+            escaped = pattern[i + 1]
+            if not escaped.isalnum():
+                literal = escaped
+            i += 2
+        elif char == '[':
+            i = _skip_class(pattern, i)
+        elif char == '(':
+            # Skip to the matching parenthesis; the group is not a literal
+            depth = 1
+            i += 1
+            while depth:
+                if pattern[i] == '\\':
+                    i += 2
+                    continue
+                if pattern[i] == '[':
+                    i = _skip_class(pattern, i)
+                    continue
+                depth += {'(': 1, ')': -1}.get(pattern[i], 0)
+                i += 1
+        else:
+            if char not in '.^$':
+                literal = char
+            i += 1
+        
+        quantifier = pattern[i] if i < len(pattern) else ''
+        if literal is not None and quantifier not in ('?', '*') and not pattern.startswith('{0', i):
+            run += literal.lower()
+            if quantifier in ('+', '{'):
+                # Repeated: the literal is required, but more copies may follow it
+                runs.append(run)
+                run = ''
+        else:
+            runs.append(run)
+            run = ''
+        
+        # Skip the quantifier itself (and a lazy marker)
+        if quantifier == '{':
+            i = pattern.index('}', i) + 1
+        elif quantifier in ('?', '*', '+'):
+            i += 1
+        if i < len(pattern) and quantifier and pattern[i] == '?':
+            i += 1
+    
+    runs.append(run)
+    return max(runs, key=len) or None
+
 class DocumentProcessor:
     """
     Comprehensive document processor for insurance, legal, HR, and compliance documents.
@@ -43,14 +224,45 @@ class DocumentProcessor:
             'text/html': self._process_html,
         }
         
+        # sha256(document bytes) -> (file_type, raw_text, cleaned_text, chunks, metadata),
+        # kept in least-recently-used order and bounded by the size of the cached text
+        self._document_cache: "OrderedDict[str, Tuple[str, str, str, List[str], Dict]]" = OrderedDict()
+        self._document_cache_bytes = 0
+        
         # Initialize comprehensive keyword sets
         self.insurance_keywords = self._initialize_insurance_keywords()
         self.normalization_patterns = self._initialize_normalization_patterns()
         self.structure_patterns = self._initialize_structure_patterns()
+        self.document_type_indicators = self._initialize_document_type_indicators()
+        
+        # term -> categories it belongs to, matched in one pass when available
+        self._keyword_categories: Dict[str, List[str]] = {}
+        for category, terms in self.insurance_keywords.items():
+            for term in terms:
+                self._keyword_categories.setdefault(sys.intern(term.lower()), []).append(category)
+        # Keywords and document type indicators share one automaton
+        self._scan_terms = set(self._keyword_categories).union(*self.document_type_indicators.values())
+        self._keyword_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            self._keyword_automaton = ahocorasick.Automaton()
+            for term in self._scan_terms:
+                self._keyword_automaton.add_word(term, term)
+            self._keyword_automaton.make_automaton()
+        
+        # Compiled once here; every document reuses them. Each rule carries the
+        # literal its matches must contain, so rules that cannot match are skipped.
+        self._compiled_normalization = [
+            (_required_literal(pattern), re.compile(pattern, re.IGNORECASE), replacement)
+            for pattern, replacement in self.normalization_patterns.items()
+        ]
+        self._compiled_structure = [
+            (re.compile(pattern, re.IGNORECASE), replacement)
+            for pattern, replacement in self.structure_patterns.items()
+        ]
 
-    def _initialize_insurance_keywords(self) -> Dict[str, Set[str]]:
+    def _initialize_insurance_keywords(self) -> Dict[str, FrozenSet[str]]:
         """Initialize comprehensive insurance terminology keywords (800+)."""
-        return {
+        keywords = {
             'policy_terms': {
                 'policy', 'insurance policy', 'contract', 'agreement', 'terms and conditions',
                 'policy document', 'insurance contract', 'policy terms', 'insurance terms',
@@ -329,8 +541,9 @@ class DocumentProcessor:
                 'permanent disability', 'accidental death', 'natural death'
             }
         }
+        return {category: _freeze(terms) for category, terms in keywords.items()}
 
-    def _initialize_normalization_patterns(self) -> Dict[str, str]:
+    def _initialize_normalization_patterns(self) -> Dict[str, Union[str, Callable[['re.Match[str]'], str]]]:
         """Initialize comprehensive normalization patterns (200+)."""
         return {
             # Standardize spacing and hyphens
@@ -373,11 +586,12 @@ class DocumentProcessor:
             r'medical\s*facility': 'Medical Facility',
             r'healthcare\s*facility': 'Healthcare Facility',
             
+            # Normalize numeric time periods and percentages in one pass. The
+            # word forms below produce canonical units already, so running this
+            # ahead of the percentage words is order-independent.
+            _PERIOD_UNIT_PATTERN: _canonical_period,
+            
             # Normalize time periods
-            r'(\d+)\s*years?': r'\1 years',
-            r'(\d+)\s*months?': r'\1 months',
-            r'(\d+)\s*days?': r'\1 days',
-            r'(\d+)\s*hours?': r'\1 hours',
             r'thirty[\s\-]*six\s*months?': '36 months',
             r'twenty[\s\-]*four\s*months?': '24 months',
             r'eighteen\s*months?': '18 months',
@@ -388,9 +602,6 @@ class DocumentProcessor:
             r'one\s*hundred\s*eighty\s*days?': '180 days',
             
             # Normalize percentage formats
-            r'(\d+)\s*%': r'\1%',
-            r'(\d+)\s*percent': r'\1%',
-            r'(\d+)\s*per\s*cent': r'\1%',
             r'one\s*percent': '1%',
             r'two\s*percent': '2%',
             r'five\s*percent': '5%',
@@ -402,8 +613,10 @@ class DocumentProcessor:
             r'rupees?\s*(\d+)': r'Rs. \1',
             r'rs\.?\s*(\d+)': r'Rs. \1',
             r'inr\s*(\d+)': r'INR \1',
-            r'(\d+)\s*lakhs?': r'\1 lakhs',
-            r'(\d+)\s*crores?': r'\1 crores',
+            
+            # Numeric amounts, distances and bed counts in one pass, likewise
+            # ahead of the word forms below
+            _QUANTITY_UNIT_PATTERN: _canonical_quantity,
             r'one\s*lakh': '1 lakh',
             r'two\s*lakhs?': '2 lakhs',
             r'five\s*lakhs?': '5 lakhs',
@@ -413,14 +626,10 @@ class DocumentProcessor:
             r'one\s*crore': '1 crore',
             
             # Normalize distance measurements
-            r'(\d+)\s*km': r'\1 km',
-            r'(\d+)\s*kilometer': r'\1 kilometers',
-            r'(\d+)\s*kilometre': r'\1 kilometres',
             r'one\s*hundred\s*fifty\s*km': '150 km',
             r'three\s*hundred\s*km': '300 km',
             
             # Normalize bed requirements
-            r'(\d+)\s*beds?': r'\1 beds',
             r'ten\s*beds?': '10 beds',
             r'fifteen\s*beds?': '15 beds',
             r'twenty\s*beds?': '20 beds',
@@ -592,6 +801,13 @@ class DocumentProcessor:
             # Download document
             document_data = await self._download_document(document_url)
             
+            # The same bytes always parse to the same result, whatever the URL.
+            # hashlib releases the GIL on large buffers, so hash off the event loop
+            content_key, doc_hash = await asyncio.to_thread(_hash_document, document_data)
+            cached_result = self._cached_document_result(content_key, document_url)
+            if cached_result is not None:
+                return cached_result
+            
             # Detect file type
             file_type = self._detect_file_type(document_data)
             logger.info(f"Detected file type: {file_type} ({len(document_data)/1024:.1f} KB)")
@@ -606,18 +822,12 @@ class DocumentProcessor:
             if not raw_text.strip():
                 raise DocumentProcessingError("No text content extracted from document")
             
-            # Comprehensive text cleaning and normalization
-            cleaned_text = self._comprehensive_clean_text(raw_text)
-            
-            # Intelligent chunking optimized for insurance/legal documents
-            chunks = self._intelligent_chunk_text(cleaned_text)
-            
-            # Generate document hash
-            doc_hash = hashlib.md5(document_data).hexdigest()
-            
-            # Compile metadata with enhanced statistics
-            metadata = self._generate_enhanced_metadata(document_data, raw_text, cleaned_text, chunks)
+            # Cleaning, chunking and analysis are CPU-bound; run them off the event loop
+            cleaned_text, chunks, metadata = await asyncio.to_thread(
+                self._analyze_document_text, document_data, raw_text
+            )
             metadata['hash_md5'] = doc_hash
+            self._cache_document(content_key, (file_type, raw_text, cleaned_text, list(chunks), dict(metadata)))
             
             result = {
                 'document_id': doc_hash,
@@ -638,6 +848,65 @@ class DocumentProcessor:
             logger.error(f"Document processing failed: {str(e)}")
             raise DocumentProcessingError(f"Failed to process document: {str(e)}")
 
+    def _cached_document_result(
+        self, content_key: str, document_url: str
+    ) -> Optional[Dict[str, Union[str, List[str], Dict]]]:
+        """Build a fresh result for an already parsed document, or None if it is not cached."""
+        cached = self._document_cache.get(content_key)
+        if cached is None:
+            return None
+        
+        self._document_cache.move_to_end(content_key)
+        file_type, raw_text, cleaned_text, chunks, metadata = cached
+        logger.info(f"Reusing parsed document {metadata['hash_md5']} for {document_url}")
+        return {
+            'document_id': metadata['hash_md5'],
+            'url': document_url,
+            'file_type': file_type,
+            'raw_text': raw_text,
+            'cleaned_text': cleaned_text,
+            'chunks': list(chunks),
+            'metadata': dict(metadata)
+        }
+
+    def _cache_document(self, content_key: str, entry: Tuple[str, str, str, List[str], Dict]) -> None:
+        """Remember a parsed document, evicting the least recently used ones over budget."""
+        entry_bytes = self._document_cache_entry_bytes(entry)
+        if entry_bytes > self.settings.DOCUMENT_CACHE_MAX_BYTES:
+            return
+        
+        previous = self._document_cache.pop(content_key, None)
+        if previous is not None:
+            self._document_cache_bytes -= self._document_cache_entry_bytes(previous)
+        self._document_cache[content_key] = entry
+        self._document_cache_bytes += entry_bytes
+        
+        while self._document_cache_bytes > self.settings.DOCUMENT_CACHE_MAX_BYTES:
+            _, evicted = self._document_cache.popitem(last=False)
+            self._document_cache_bytes -= self._document_cache_entry_bytes(evicted)
+
+    @staticmethod
+    def _document_cache_entry_bytes(entry: Tuple[str, str, str, List[str], Dict]) -> int:
+        """Memory held by a cached document: its texts, chunks and metadata."""
+        return _deep_sizeof(entry)
+
+    def _analyze_document_text(self, document_data: bytes, raw_text: str):
+        """
+        Clean, chunk and describe extracted text; returns (cleaned_text, chunks, metadata).
+        
+        The caller adds metadata['hash_md5'], computed alongside the content key.
+        """
+        # Comprehensive text cleaning and normalization
+        cleaned_text = self._comprehensive_clean_text(raw_text)
+        
+        # Intelligent chunking optimized for insurance/legal documents
+        chunks = self._intelligent_chunk_text(cleaned_text)
+        
+        # Compile metadata with enhanced statistics
+        metadata = self._generate_enhanced_metadata(document_data, raw_text, cleaned_text, chunks)
+        
+        return cleaned_text, chunks, metadata
+
     def _generate_enhanced_metadata(self, document_data: bytes, raw_text: str, 
                                    cleaned_text: str, chunks: List[str]) -> Dict:
         """Generate comprehensive metadata with insurance-specific analysis."""
@@ -654,60 +923,76 @@ class DocumentProcessor:
             }
         }
         
-        # Detect insurance-specific content
+        # Detect insurance-specific content with one scan of the lowered text
         text_lower = cleaned_text.lower()
-        insurance_terms_detected = 0
-        category_counts = {}
-        
-        for category, terms in self.insurance_keywords.items():
-            category_count = 0
-            for term in terms:
-                if term.lower() in text_lower:
-                    category_count += 1
-                    insurance_terms_detected += 1
-            category_counts[category] = category_count
+        found_terms = self._find_terms(text_lower)
+        category_counts = self._count_insurance_terms(text_lower, found_terms)
+        insurance_terms_detected = sum(category_counts.values())
         
         metadata.update({
             'insurance_terms_detected': insurance_terms_detected,
             'category_analysis': category_counts,
-            'document_type_indicators': self._analyze_document_type(text_lower),
-            'complexity_score': self._calculate_complexity_score(cleaned_text),
+            'document_type_indicators': self._analyze_document_type(text_lower, found_terms),
+            'complexity_score': self._calculate_complexity_score(cleaned_text, insurance_terms_detected),
             'readability_metrics': self._calculate_readability_metrics(cleaned_text)
         })
         
         return metadata
 
-    def _analyze_document_type(self, text: str) -> Dict[str, bool]:
-        """Analyze document type based on content indicators."""
+    def _find_terms(self, text_lower: str) -> Set[str]:
+        """Find which keyword and document type terms occur in lowercased text."""
+        if self._keyword_automaton is not None:
+            return {term for _, term in self._keyword_automaton.iter(text_lower)}
+        return {term for term in self._scan_terms if term in text_lower}
+
+    def _count_insurance_terms(self, text_lower: str, found_terms: Optional[Set[str]] = None) -> Dict[str, int]:
+        """Count the distinct insurance terms present in lowercased text, per category."""
+        if found_terms is None:
+            found_terms = self._find_terms(text_lower)
+        
+        category_counts = dict.fromkeys(self.insurance_keywords, 0)
+        for term in found_terms:
+            for category in self._keyword_categories.get(term, ()):
+                category_counts[category] += 1
+        return category_counts
+
+    def _initialize_document_type_indicators(self) -> Dict[str, FrozenSet[str]]:
+        """Initialize the terms that indicate each document type."""
         indicators = {
-            'health_insurance': any(term in text for term in [
-                'health insurance', 'medical insurance', 'hospitalization', 'sum insured'
-            ]),
-            'travel_insurance': any(term in text for term in [
-                'travel insurance', 'trip', 'journey', 'common carrier'
-            ]),
-            'life_insurance': any(term in text for term in [
-                'life insurance', 'death benefit', 'maturity', 'surrender'
-            ]),
-            'group_insurance': any(term in text for term in [
-                'group insurance', 'employee', 'corporate', 'master policy'
-            ]),
-            'motor_insurance': any(term in text for term in [
-                'motor insurance', 'vehicle', 'automobile', 'third party'
-            ]),
-            'policy_wording': any(term in text for term in [
-                'policy wording', 'terms and conditions', 'exclusions', 'definitions'
-            ])
+            'health_insurance': {'health insurance', 'medical insurance', 'hospitalization', 'sum insured'},
+            'travel_insurance': {'travel insurance', 'trip', 'journey', 'common carrier'},
+            'life_insurance': {'life insurance', 'death benefit', 'maturity', 'surrender'},
+            'group_insurance': {'group insurance', 'employee', 'corporate', 'master policy'},
+            'motor_insurance': {'motor insurance', 'vehicle', 'automobile', 'third party'},
+            'policy_wording': {'policy wording', 'terms and conditions', 'exclusions', 'definitions'}
         }
-        return indicators
+        return {document_type: _freeze(terms) for document_type, terms in indicators.items()}
 
-    def _calculate_complexity_score(self, text: str) -> float:
-        """Calculate document complexity score based on various factors."""
+    def _analyze_document_type(self, text: str, found_terms: Optional[Set[str]] = None) -> Dict[str, bool]:
+        """Analyze document type based on content indicators."""
+        if found_terms is None:
+            found_terms = self._find_terms(text)
+        
+        return {
+            document_type: not terms.isdisjoint(found_terms)
+            for document_type, terms in self.document_type_indicators.items()
+        }
+
+    def _calculate_complexity_score(self, text: str, technical_terms: Optional[int] = None) -> float:
+        """
+        Calculate document complexity score based on various factors.
+        
+        Args:
+            text: Cleaned document text
+            technical_terms: Insurance term count already computed for this text, if any
+        """
+        if technical_terms is None:
+            technical_terms = sum(self._count_insurance_terms(text.lower()).values())
+        
         factors = {
             'avg_sentence_length': len(text.split()) / max(1, text.count('.')),
-            'technical_terms': sum(1 for category in self.insurance_keywords.values() 
-                                 for term in category if term.lower() in text.lower()),
-            'numerical_references': len(re.findall(r'\d+', text)),
+            'technical_terms': technical_terms,
+            'numerical_references': len(_DIGIT_RUN.findall(text)),
             'section_complexity': text.count('SECTION:') + text.count('TABLE:')
         }
         
@@ -725,7 +1010,7 @@ class DocumentProcessor:
         """Calculate basic readability metrics."""
         sentences = text.count('.') + text.count('!') + text.count('?')
         words = len(text.split())
-        characters = len(text.replace(' ', ''))
+        characters = len(text) - text.count(' ')
         
         if sentences == 0 or words == 0:
             return {'avg_sentence_length': 0.0, 'avg_word_length': 0.0}
@@ -740,33 +1025,34 @@ class DocumentProcessor:
     async def _download_document(self, url: str) -> bytes:
         """Download document with retries and size validation."""
         max_size = 100 * 1024 * 1024  # 100MB
-        timeout = httpx.Timeout(120.0, connect=30.0)
         
         try:
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                
-                content_length = response.headers.get('content-length')
-                if content_length and int(content_length) > max_size:
-                    raise DocumentProcessingError(f"Document too large: {int(content_length)/1024/1024:.1f}MB (max: 100MB)")
-                
-                content = response.content
-                if len(content) > max_size:
-                    raise DocumentProcessingError("Document too large after download")
-                
-                return content
+            async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT, follow_redirects=True) as client:
+                async with client.stream('GET', url) as response:
+                    response.raise_for_status()
+                    
+                    content_length = response.headers.get('content-length')
+                    if content_length and int(content_length) > max_size:
+                        raise DocumentProcessingError(f"Document too large: {int(content_length)/1024/1024:.1f}MB (max: 100MB)")
+                    
+                    # Enforce the limit while streaming so an oversized body without
+                    # a Content-Length is abandoned instead of buffered in full
+                    parts = []
+                    received = 0
+                    async for part in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        received += len(part)
+                        if received > max_size:
+                            raise DocumentProcessingError("Document too large after download")
+                        parts.append(part)
+            
+            return b"".join(parts)
                 
         except httpx.HTTPError as e:
             raise DocumentProcessingError(f"Failed to download document: {str(e)}")
 
     def _detect_file_type(self, data: bytes) -> str:
         """Enhanced file type detection with fallbacks."""
-        try:
-            mime_type = magic.from_buffer(data, mime=True)
-        except Exception:
-            mime_type = 'application/octet-stream'
-        
+        # Known signatures win over libmagic, so check them before sniffing
         if data.startswith(b'%PDF'):
             return 'application/pdf'
         elif data.startswith(b'PK\x03\x04') and b'word/' in data[:4096]:
@@ -774,42 +1060,26 @@ class DocumentProcessor:
         elif data.startswith(b'<!DOCTYPE html') or data.startswith(b'<html'):
             return 'text/html'
         
-        return mime_type
+        # libmagic only needs the header; don't hand it the whole document
+        try:
+            return magic.from_buffer(data[:MAGIC_HEADER_BYTES], mime=True)
+        except Exception:
+            return 'application/octet-stream'
 
     async def _process_pdf(self, data: bytes) -> str:
         """Comprehensive PDF processing with advanced text extraction."""
+        if PYMUPDF_AVAILABLE:
+            try:
+                text_parts = await self._extract_with_pymupdf(data)
+                if text_parts:
+                    return "\n\n".join(text_parts)
+            except Exception as e:
+                logger.warning(f"PyMuPDF failed: {e}, trying pdfplumber")
+        
         text_parts = []
         
         try:
-            with io.BytesIO(data) as pdf_buffer:
-                with pdfplumber.open(pdf_buffer) as pdf:
-                    logger.info(f"Processing PDF with {len(pdf.pages)} pages using pdfplumber")
-                    
-                    for page_num, page in enumerate(pdf.pages, 1):
-                        page_text = page.extract_text(
-                            x_tolerance=2,
-                            y_tolerance=3,
-                            layout=True,
-                            x_density=7.25,
-                            y_density=7.25
-                        )
-                        
-                        if page_text and page_text.strip():
-                            cleaned_page_text = self._clean_pdf_text(page_text)
-                            text_parts.append(f"PAGE {page_num}:\n{cleaned_page_text}")
-                        
-                        tables = page.extract_tables()
-                        for table_idx, table in enumerate(tables):
-                            if table and len(table) > 0:
-                                formatted_table = self._format_table_comprehensive(
-                                    table, 
-                                    f"Table {table_idx + 1} on Page {page_num}"
-                                )
-                                if formatted_table.strip():
-                                    text_parts.append(formatted_table)
-                        
-                        if hasattr(page, 'images') and page.images:
-                            text_parts.append(f"[Images detected on page {page_num}]")
+            text_parts = await self._run_pdf_job('_extract_with_pdfplumber', data)
                             
         except Exception as e:
             logger.warning(f"pdfplumber failed: {e}, trying PyPDF2 fallback")
@@ -837,6 +1107,123 @@ class DocumentProcessor:
         
         return "\n\n".join(text_parts)
 
+    async def _extract_with_pymupdf(self, data: bytes) -> List[str]:
+        """
+        Extract PDF text with PyMuPDF, using pdfplumber only for table pages.
+        
+        Pages without vector drawings cannot hold ruled tables, so pdfplumber's
+        layout analysis is skipped for them entirely.
+        """
+        pages, table_pages = await asyncio.to_thread(self._read_with_pymupdf, data)
+        if table_pages:
+            page_tables = await self._run_pdf_job('_extract_pdf_tables', data, table_pages)
+            for page_index, formatted_tables in page_tables.items():
+                pages[page_index][0].extend(formatted_tables)
+        
+        text_parts = []
+        for page_num, (page_parts, has_images) in enumerate(pages, 1):
+            text_parts.extend(page_parts)
+            if has_images:
+                text_parts.append(f"[Images detected on page {page_num}]")
+        return text_parts
+
+    def _read_with_pymupdf(self, data: bytes) -> Tuple[List[Tuple[List[str], bool]], List[int]]:
+        """Read the (text parts, has images) of every page and the indexes of pages with drawings."""
+        pages = []
+        table_pages = []
+        with fitz.open(stream=data, filetype='pdf') as doc:
+            logger.info(f"Processing PDF with {doc.page_count} pages using PyMuPDF")
+            for page_index, page in enumerate(doc):
+                page_parts = []
+                page_text = page.get_text('text')
+                if page_text and page_text.strip():
+                    cleaned_page_text = self._clean_pdf_text(page_text)
+                    page_parts.append(f"PAGE {page_index + 1}:\n{cleaned_page_text}")
+                if page.get_drawings():
+                    table_pages.append(page_index)
+                pages.append((page_parts, bool(page.get_images())))
+        return pages, table_pages
+
+    def _extract_pdf_tables(self, data: bytes, page_indexes: List[int]) -> Dict[int, List[str]]:
+        """Extract the formatted tables of the given pages with pdfplumber."""
+        page_tables = {}
+        with io.BytesIO(data) as pdf_buffer:
+            with pdfplumber.open(pdf_buffer) as pdf:
+                for page_index in page_indexes:
+                    tables = pdf.pages[page_index].extract_tables()
+                    for table_idx, table in enumerate(tables):
+                        if table and len(table) > 0:
+                            formatted_table = self._format_table_comprehensive(
+                                table,
+                                f"Table {table_idx + 1} on Page {page_index + 1}"
+                            )
+                            if formatted_table.strip():
+                                page_tables.setdefault(page_index, []).append(formatted_table)
+        return page_tables
+
+    async def _run_pdf_job(self, method_name: str, *args):
+        """
+        Run a pdfplumber extraction method in the PDF worker pool.
+        
+        pdfplumber's layout analysis is pure Python, so it runs in a worker
+        process; without a pool it runs in a thread. A crashed worker breaks
+        the whole pool; it is replaced and the job retried once.
+        """
+        pool = _get_pdf_pool()
+        if pool is None:
+            return await asyncio.to_thread(getattr(self, method_name), *args)
+        
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(pool, _pdf_worker, method_name, *args)
+        except BrokenProcessPool:
+            logger.warning("PDF worker pool broke, restarting it")
+            _discard_pdf_pool(pool)
+            pool = _get_pdf_pool()
+            if pool is None:
+                return await asyncio.to_thread(getattr(self, method_name), *args)
+            return await loop.run_in_executor(pool, _pdf_worker, method_name, *args)
+
+    def _extract_with_pdfplumber(self, data: bytes) -> List[str]:
+        """Extract the text parts of every page with pdfplumber."""
+        text_parts = []
+        with io.BytesIO(data) as pdf_buffer:
+            with pdfplumber.open(pdf_buffer) as pdf:
+                logger.info(f"Processing PDF with {len(pdf.pages)} pages using pdfplumber")
+                for page_num, page in enumerate(pdf.pages, 1):
+                    text_parts.extend(self._extract_page_text(page, page_num))
+        return text_parts
+
+    def _extract_page_text(self, page, page_num: int) -> List[str]:
+        """Extract the text, tables and image markers of one pdfplumber page."""
+        text_parts = []
+        page_text = page.extract_text(
+            x_tolerance=2,
+            y_tolerance=3,
+            layout=True,
+            x_density=7.25,
+            y_density=7.25
+        )
+        
+        if page_text and page_text.strip():
+            cleaned_page_text = self._clean_pdf_text(page_text)
+            text_parts.append(f"PAGE {page_num}:\n{cleaned_page_text}")
+        
+        tables = page.extract_tables()
+        for table_idx, table in enumerate(tables):
+            if table and len(table) > 0:
+                formatted_table = self._format_table_comprehensive(
+                    table, 
+                    f"Table {table_idx + 1} on Page {page_num}"
+                )
+                if formatted_table.strip():
+                    text_parts.append(formatted_table)
+        
+        if hasattr(page, 'images') and page.images:
+            text_parts.append(f"[Images detected on page {page_num}]")
+        
+        return text_parts
+
     def _clean_pdf_text(self, text: str) -> str:
         """Advanced PDF text cleaning with insurance document specifics."""
         if not text:
@@ -845,18 +1232,18 @@ class DocumentProcessor:
         text = text.replace('\u00ad', '')  # soft hyphen
         text = text.replace('\u200b', '')  # zero-width space
         
-        text = re.sub(r'(\w+)-\s*\n\s*(\w+)', r'\1\2', text)
-        text = re.sub(r'(\w+)\s*\n\s*(\w+)', lambda m: 
+        text = _HYPHENATED_BREAK.sub(r'\1\2', text)
+        text = _WRAPPED_WORDS.sub(lambda m: 
                      f"{m.group(1)}{m.group(2)}" if m.group(1).islower() and m.group(2).islower() 
                      else f"{m.group(1)} {m.group(2)}", text)
         
-        text = re.sub(r'\s+([,.;:!?])', r'\1', text)
-        text = re.sub(r'([,.;:!?])\s*([A-Z])', r'\1 \2', text)
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-        text = re.sub(r'\n\s*(\d+\.)\s*', r'\n\1 ', text)
-        text = re.sub(r'\n\s*([a-z]\))\s*', r'\n\1 ', text)
-        text = re.sub(r'\n\s*([•·▪▫‣⁃])\s*', r'\n• ', text)
+        text = _SPACE_BEFORE_PUNCTUATION.sub(r'\1', text)
+        text = _PUNCTUATION_BEFORE_CAPITAL.sub(r'\1 \2', text)
+        text = _WHITESPACE_RUN.sub(' ', text)
+        text = _BLANK_LINE_RUN.sub('\n\n', text)
+        text = _NUMBERED_ITEM.sub(r'\n\1 ', text)
+        text = _LETTERED_ITEM.sub(r'\n\1 ', text)
+        text = _BULLET_ITEM.sub(r'\n• ', text)
         
         return text.strip()
 
@@ -874,8 +1261,8 @@ class DocumentProcessor:
                 for cell in row:
                     if cell:
                         cell_content = str(cell).strip()
-                        cell_content = re.sub(r'\s+', ' ', cell_content)
-                        cell_content = re.sub(r'\n+', ' ', cell_content)
+                        cell_content = _WHITESPACE_RUN.sub(' ', cell_content)
+                        cell_content = _NEWLINE_RUN.sub(' ', cell_content)
                         cleaned_row.append(cell_content)
                     else:
                         cleaned_row.append("")
@@ -967,17 +1354,29 @@ class DocumentProcessor:
 
     async def _process_docx(self, data: bytes) -> str:
         """Comprehensive DOCX processing with enhanced table and structure handling."""
+        return await asyncio.to_thread(self._parse_docx, data)
+
+    def _parse_docx(self, data: bytes) -> str:
+        """Blocking body of _process_docx."""
         text_parts = []
         
         try:
             with io.BytesIO(data) as docx_buffer:
                 doc = DocxDocument(docx_buffer)
                 
+                # paragraph.style scans the whole styles part on every access,
+                # so resolve each style id to its name once per document
+                style_names: Dict[Optional[str], str] = {}
+                
                 for para_idx, paragraph in enumerate(doc.paragraphs):
-                    if paragraph.text.strip():
-                        para_text = paragraph.text.strip()
+                    para_text = paragraph.text.strip()
+                    if para_text:
+                        style_id = paragraph._p.style
+                        if style_id not in style_names:
+                            style = paragraph.style
+                            style_names[style_id] = style.name.lower() if style and style.name else ''
                         
-                        if paragraph.style and 'heading' in paragraph.style.name.lower():
+                        if 'heading' in style_names[style_id]:
                             para_text = f"SECTION: {para_text}"
                         elif para_text.isupper() and len(para_text) > 10:
                             para_text = f"HEADING: {para_text}"
@@ -1017,6 +1416,10 @@ class DocumentProcessor:
 
     async def _process_email(self, data: bytes) -> str:
         """Comprehensive email processing with attachment handling."""
+        return await asyncio.to_thread(self._parse_email, data)
+
+    def _parse_email(self, data: bytes) -> str:
+        """Blocking body of _process_email."""
         text_parts = []
         
         try:
@@ -1089,15 +1492,32 @@ class DocumentProcessor:
 
     async def _process_html(self, data: bytes) -> str:
         """Process HTML with comprehensive text extraction."""
+        return await asyncio.to_thread(self._parse_html, data)
+
+    def _parse_html(self, data: bytes) -> str:
+        """Blocking body of _process_html."""
         try:
             html_content = data.decode('utf-8', errors='ignore')
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            for script in soup(["script", "style"]):
-                script.decompose()
+            text = None
+            
+            if SELECTOLAX_AVAILABLE:
+                try:
+                    tree = LexborHTMLParser(html_content)
+                    tree.strip_tags(["script", "style"])
+                    # lexbor keeps whitespace-only nodes as empty lines; BeautifulSoup drops them
+                    text = '\n'.join(line for line in tree.root.text(separator='\n', strip=True).split('\n') if line)
+                except Exception as e:
+                    logger.warning(f"selectolax failed: {e}, trying BeautifulSoup")
+            
+            if text is None:
+                soup = BeautifulSoup(html_content, 'html.parser')
+                
+                for script in soup(["script", "style"]):
+                    script.decompose()
+                
+                text = soup.get_text(separator='\n', strip=True)
             
-            text = soup.get_text(separator='\n', strip=True)
-            text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+            text = _BLANK_LINE_RUN.sub('\n\n', text)
             
             return text
             
@@ -1115,26 +1535,40 @@ class DocumentProcessor:
 
     def _normalize_insurance_terminology(self, text: str) -> str:
         """Normalize insurance-specific terminology using comprehensive patterns."""
-        # Apply all normalization patterns
-        for pattern, replacement in self.normalization_patterns.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        # Apply all normalization patterns, in order. A rule whose literal is
+        # absent from the current text cannot match, so its regex scan is
+        # skipped; the lowered text is refreshed whenever a rule changes it.
+        text_folded = text.translate(_IGNORECASE_FOLD).lower()
+        for literal, pattern, replacement in self._compiled_normalization:
+            if literal is not None and literal not in text_folded:
+                continue
+            normalized = pattern.sub(replacement, text)
+            if normalized != text:
+                text = normalized
+                text_folded = text.translate(_IGNORECASE_FOLD).lower()
         
         return text
 
     def _preserve_document_structure(self, text: str) -> str:
         """Preserve important document structure using structure patterns."""
+        # Every structure pattern starts at a line break, so text that has
+        # none (clean_text folds whitespace to spaces) cannot match any rule.
+        # Rules stay sequential: later ones match the breaks earlier ones add.
+        if '\n' not in text:
+            return text
+        
         # Apply structure recognition patterns
-        for pattern, replacement in self.structure_patterns.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        for pattern, replacement in self._compiled_structure:
+            text = pattern.sub(replacement, text)
         
         return text
 
     def _final_text_cleanup(self, text: str) -> str:
         """Final comprehensive text cleanup."""
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-        text = re.sub(r'\.([A-Z])', r'. \1', text)
-        text = re.sub(r'\n\s*[•·▪▫‣⁃]\s*', '\n• ', text)
+        text = _WHITESPACE_RUN.sub(' ', text)
+        text = _BLANK_LINE_RUN.sub('\n\n', text)
+        text = _PERIOD_BEFORE_CAPITAL.sub(r'. \1', text)
+        text = _BULLET_LINE.sub('\n• ', text)
         
         return text.strip()
 
@@ -1167,25 +1601,15 @@ class DocumentProcessor:
 
     def _split_by_document_sections(self, text: str) -> List[str]:
         """Split text by major document sections while preserving context."""
-        section_patterns = [
-            r'\n\nSECTION:\s*([^\n]+)\n\n',
-            r'\n\nSUBSECTION:\s*([^\n]+)\n\n',
-            r'\n=== .+ ===\n',
-            r'\nPAGE \d+:\n',
-            r'\n\nCLAUSE \d+\.',
-            r'\n{3,}'
-        ]
-        
         sections = [text]
         
-        for pattern in section_patterns:
+        for pattern in _SECTION_BOUNDARIES:
             new_sections = []
             for section in sections:
-                parts = re.split(pattern, section, flags=re.IGNORECASE)
-                if len(parts) == 1:
+                matches = list(pattern.finditer(section))
+                if not matches:
                     new_sections.append(section)
                 else:
-                    matches = list(re.finditer(pattern, section, flags=re.IGNORECASE))
                     last_end = 0
                     
                     for i, match in enumerate(matches):
@@ -1210,7 +1634,7 @@ class DocumentProcessor:
         current_chunk = ""
         
         for paragraph in paragraphs:
-            if len(current_chunk + "\n\n" + paragraph) > target_size and current_chunk:
+            if len(current_chunk) + 2 + len(paragraph) > target_size and current_chunk:
                 chunks.append(current_chunk.strip())
                 
                 if overlap_size > 0 and len(current_chunk) > overlap_size:
@@ -1239,3 +1663,41 @@ class DocumentProcessor:
                 final_chunks.extend(sub_chunks)
         
         return final_chunks
+
+def _pdf_worker(method_name: str, *args):
+    """Run a DocumentProcessor extraction method in a pool process."""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = DocumentProcessor()
+    return getattr(_worker_processor, method_name)(*args)
+
+def _get_pdf_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the PDF worker pool, creating it on first use."""
+    global _pdf_pool, _PDF_WORKERS
+    if _pdf_pool is None and _PDF_WORKERS > 0:
+        try:
+            # Spawned rather than forked: the server process already runs model
+            # threads. Each worker re-imports the __main__ module, so the server
+            # must be started with `uvicorn main:app`, not `python main.py`.
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=_PDF_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"PDF worker pool unavailable, parsing PDFs in-process: {e}")
+            _PDF_WORKERS = 0
+    return _pdf_pool
+
+def shutdown_pdf_pool() -> None:
+    """Stop the PDF worker processes, cancelling queued documents."""
+    global _pdf_pool
+    pool, _pdf_pool = _pdf_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def _discard_pdf_pool(broken: ProcessPoolExecutor) -> None:
+    """Drop a broken PDF worker pool without waiting for its processes to exit."""
+    global _pdf_pool
+    if _pdf_pool is broken:
+        _pdf_pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
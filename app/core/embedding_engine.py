@@ -20,6 +20,12 @@ logger = logging.getLogger(__name__)
 class EmbeddingEngine:
     """Handles text embedding generation and vector similarity search."""
     
+    # From this many vectors on, searches prefilter on an int8 copy of the
+    # embeddings and rerank the best INT8_PREFILTER_OVERSAMPLE * k exactly
+    INT8_PREFILTER_MIN_VECTORS = 10_000
+    INT8_PREFILTER_OVERSAMPLE = 4
+    INT8_PREFILTER_BLOCK_ROWS = 4096
+    
     def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2", cache_dir: Optional[str] = None):
         self.settings = get_settings()
         self.model_name = model_name
@@ -29,6 +35,10 @@ class EmbeddingEngine:
         self.chunk_metadata: Dict[int, Dict] = {}
         self.dimension = 384  # all-MiniLM-L6-v2 embedding dimension
         
+        # Symmetric per-row int8 quantization of the indexed embeddings
+        self.int8_embeddings = np.empty((0, self.dimension), dtype=np.int8)
+        self.int8_scales = np.empty(0, dtype=np.float32)
+        
         # Initialize directories
         os.makedirs(self.cache_dir, exist_ok=True)
         
@@ -86,6 +96,7 @@ class EmbeddingEngine:
                     self.chunk_metadata = pickle.load(f)
                 
                 logger.info(f"Loaded index with {self.index.ntotal} vectors")
+                self._rebuild_int8_embeddings()
             else:
                 # Create new index
                 logger.info("Creating new FAISS index")
@@ -172,6 +183,7 @@ class EmbeddingEngine:
             
             # Add embeddings to index
             self.index.add(embeddings.astype(np.float32))
+            self._append_int8_embeddings(embeddings)
             
             # Store metadata
             for i, chunk in enumerate(chunks):
@@ -215,17 +227,49 @@ class EmbeddingEngine:
             # Generate query embedding
             query_embedding = await self.encode([query])
             
-            # Search in index
-            scores, indices = self.index.search(query_embedding.astype(np.float32), k)
+            return self.search_by_embedding(query_embedding[0], k=k, threshold=threshold)
+            
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            raise EmbeddingGenerationError(f"Search failed: {str(e)}")
+    
+    def search_by_embedding(self, query_embedding: np.ndarray, k: int = 8, threshold: float = 0.3) -> List[Dict]:
+        """
+        Search for similar chunks using a precomputed query embedding.
+        
+        Lets callers encode many queries in one batch and then search each.
+        
+        Args:
+            query_embedding: Normalized query embedding vector
+            k: Number of results to return
+            threshold: Minimum similarity threshold
+            
+        Returns:
+            List of similar chunks with metadata
+        """
+        if self.index is None or self.index.ntotal == 0:
+            logger.warning("Index is empty, no results to return")
+            return []
+        
+        try:
+            query = query_embedding.reshape(1, -1).astype(np.float32)
+            
+            if self.index.ntotal >= self.INT8_PREFILTER_MIN_VECTORS and \
+                    len(self.int8_scales) == self.index.ntotal:
+                scores, indices = self._search_int8_prefiltered(query[0], k)
+            else:
+                # Search in index
+                scores, indices = self.index.search(query, k)
+                scores, indices = scores[0], indices[0]
             
             # Filter results by threshold and format output
             results = []
-            for score, idx in zip(scores[0], indices[0]):
+            for score, idx in zip(scores, indices):
                 if idx == -1:  # FAISS returns -1 for empty slots
                     continue
                     
                 if score >= threshold:
-                    chunk_info = self.chunk_metadata.get(idx, {})
+                    chunk_info = self.chunk_metadata.get(int(idx), {})
                     results.append({
                         'chunk_id': int(idx),
                         'score': float(score),
@@ -242,6 +286,65 @@ class EmbeddingEngine:
             logger.error(f"Search failed: {e}")
             raise EmbeddingGenerationError(f"Search failed: {str(e)}")
     
+    def _search_int8_prefiltered(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k on int8 embeddings, then exact rerank of the candidates.
+        
+        Args:
+            query: Normalized float32 query vector
+            k: Number of results to return
+            
+        Returns:
+            Tuple of (scores, indices), best first
+        """
+        total = len(self.int8_scales)
+        approx = np.empty(total, dtype=np.float32)
+        
+        # Dequantize block by block so only the int8 copy is streamed from memory
+        for start in range(0, total, self.INT8_PREFILTER_BLOCK_ROWS):
+            block = self.int8_embeddings[start:start + self.INT8_PREFILTER_BLOCK_ROWS]
+            approx[start:start + len(block)] = block.astype(np.float32) @ query
+        approx *= self.int8_scales
+        
+        num_candidates = min(total, k * self.INT8_PREFILTER_OVERSAMPLE)
+        candidates = np.argpartition(-approx, num_candidates - 1)[:num_candidates]
+        
+        # Exact inner products for the shortlisted vectors
+        vectors = np.vstack([self.index.reconstruct(int(idx)) for idx in candidates])
+        exact = vectors @ query
+        
+        order = np.argsort(-exact)[:k]
+        return exact[order], candidates[order]
+    
+    @staticmethod
+    def _quantize_int8(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Quantize embeddings to int8 with one symmetric scale per row."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        scales = np.abs(embeddings).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.round(embeddings / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+    
+    def _append_int8_embeddings(self, embeddings: np.ndarray) -> None:
+        """Extend the int8 copy with newly indexed embeddings."""
+        quantized, scales = self._quantize_int8(embeddings)
+        if len(self.int8_scales) == 0:
+            self.int8_embeddings, self.int8_scales = quantized, scales
+        else:
+            self.int8_embeddings = np.vstack([self.int8_embeddings, quantized])
+            self.int8_scales = np.concatenate([self.int8_scales, scales])
+    
+    def _rebuild_int8_embeddings(self) -> None:
+        """Rebuild the int8 copy from the vectors stored in the index."""
+        if self.index is None or self.index.ntotal == 0:
+            self.int8_embeddings = np.empty((0, self.dimension), dtype=np.int8)
+            self.int8_scales = np.empty(0, dtype=np.float32)
+            return
+        
+        self.int8_embeddings, self.int8_scales = self._quantize_int8(
+            self.index.reconstruct_n(0, self.index.ntotal)
+        )
+    
     async def _save_index(self):
         """Save FAISS index and metadata to disk."""
         try:
@@ -253,7 +356,7 @@ class EmbeddingEngine:
             
             # Save metadata
             with open(metadata_path, 'wb') as f:
-                pickle.dump(self.chunk_metadata, f)
+                pickle.dump(self.chunk_metadata, f, protocol=pickle.HIGHEST_PROTOCOL)
             
             logger.debug("Index and metadata saved successfully")
             
@@ -315,6 +418,7 @@ class EmbeddingEngine:
             self.index.add(embeddings_array)
         
         self.chunk_metadata = new_metadata
+        self._rebuild_int8_embeddings()
         
         # Save updated index
         await self._save_index()
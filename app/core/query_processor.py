@@ -492,7 +492,7 @@ class QueryProcessor:
         request_id: str
     ) -> List[str]:
         """Process multiple questions efficiently."""
-        semaphore = asyncio.Semaphore(3)  # Reduced for better stability
+        semaphore = asyncio.Semaphore(self.settings.LLM_CONCURRENCY)
         
         async def process_single_question(question: str, index: int) -> Tuple[int, str]:
             async with semaphore:
@@ -943,6 +943,13 @@ class QueryProcessor:
         query_variations = await self._preprocess_query(question)
         all_chunks = {}
         
+        # Encode every variation in one batch instead of once per search call
+        try:
+            query_embeddings = await self.embedding_engine.encode(query_variations)
+        except Exception as e:
+            logger.warning(f"Batch encoding of query variations failed: {e}")
+            return []
+        
         # Multi-pass search with different parameters
         search_passes = [
             {'threshold': 0.3, 'k': 6, 'boost': 1.0},  # Broad
@@ -957,8 +964,8 @@ class QueryProcessor:
                     adjusted_k = max(3, search_params['k'] - (i // 3))
                     adjusted_threshold = search_params['threshold'] + (i * 0.02)
                     
-                    chunks = await self.embedding_engine.search(
-                        query=query,
+                    chunks = self.embedding_engine.search_by_embedding(
+                        query_embeddings[i],
                         k=adjusted_k,
                         threshold=min(adjusted_threshold, 0.7)
                     )
@@ -6,6 +6,15 @@ from pydantic import BaseModel, Field, validator
 from typing import List, Union
 import re
 
+# Basic URL validation, compiled once at import rather than per request
+URL_PATTERN = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
 class HackRXRequest(BaseModel):
     """Request model for HackRX endpoint."""
     
@@ -29,16 +38,7 @@ class HackRXRequest(BaseModel):
         if not v.strip():
             raise ValueError("Document URL cannot be empty")
         
-        # Basic URL validation
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        
-        if not url_pattern.match(v):
+        if not URL_PATTERN.match(v):
             raise ValueError("Invalid URL format")
         
         return v
@@ -2,12 +2,13 @@
 Cache service for Redis-based caching operations.
 """
 
-import json
 import logging
 import pickle
 from typing import Any, Optional, Union
 import asyncio
 
+import orjson
+
 try:
     import redis.asyncio as redis
     REDIS_AVAILABLE = True
@@ -72,8 +73,8 @@ class CacheService:
             
             # Try to deserialize as JSON first, then pickle
             try:
-                return json.loads(data.decode('utf-8'))
-            except (json.JSONDecodeError, UnicodeDecodeError):
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
                 return pickle.loads(data)
                 
         except Exception as e:
@@ -103,9 +104,9 @@ class CacheService:
         try:
             # Try to serialize as JSON first, then pickle
             try:
-                serialized_data = json.dumps(value).encode('utf-8')
-            except (TypeError, ValueError):
-                serialized_data = pickle.dumps(value)
+                serialized_data = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                serialized_data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
             
             await self.redis_client.set(key, serialized_data, ex=ttl)
             return True
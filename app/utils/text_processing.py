@@ -26,8 +26,11 @@ def clean_text(text: str) -> str:
     # Remove excessive whitespace
     text = re.sub(r'\s+', ' ', text)
     
-    # Remove control characters but keep newlines and tabs
-    text = ''.join(char for char in text if char.isprintable() or char in '\n\t')
+    # Remove control characters but keep newlines and tabs. Only the distinct
+    # characters are classified, and each offender is dropped with str.replace
+    if not text.isprintable():
+        for char in {char for char in set(text) if not char.isprintable() and char not in '\n\t'}:
+            text = text.replace(char, '')
     
     # Normalize line breaks
     text = re.sub(r'\r\n|\r', '\n', text)
@@ -128,6 +131,11 @@ def split_text_into_chunks(
     
     return final_chunks
 
+# Simple sentence splitting pattern
+# This handles common abbreviations and decimal numbers. The cheap terminator
+# lookbehind comes first so most positions are rejected after one character.
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])(?<!\w\.\w.)(?<![A-Z][a-z]\.)\s+')
+
 def extract_sentences(text: str) -> List[str]:
     """
     Extract sentences from text.
@@ -141,11 +149,7 @@ def extract_sentences(text: str) -> List[str]:
     if not text:
         return []
     
-    # Simple sentence splitting pattern
-    # This handles common abbreviations and decimal numbers
-    sentence_pattern = r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\!|\?)\s+'
-    
-    sentences = re.split(sentence_pattern, text)
+    sentences = _SENTENCE_BOUNDARY.split(text)
     
     # Clean and filter sentences
     cleaned_sentences = []
@@ -180,13 +184,13 @@ def _split_by_characters(text: str, chunk_size: int, overlap: int) -> List[str]:
             break
         
         # Try to break at word boundary
-        chunk = text[start:end]
-        last_space = chunk.rfind(' ')
+        last_space = text.rfind(' ', start, end) - start
         
         if last_space > chunk_size * 0.8:  # Only break at word if it's not too early
             chunk = text[start:start + last_space]
             start = start + last_space + 1
         else:
+            chunk = text[start:end]
             start = end
         
         chunks.append(chunk.strip())
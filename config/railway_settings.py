@@ -37,6 +37,7 @@ class RailwaySettings(BaseSettings):
     # Performance settings
     MAX_WORKERS: int = int(os.getenv("MAX_WORKERS", "8"))
     CONCURRENT_REQUESTS: int = int(os.getenv("CONCURRENT_REQUESTS", "6"))
+    LLM_CONCURRENCY: int = int(os.getenv("LLM_CONCURRENCY", "3"))
     MAX_QUERY_VARIATIONS: int = int(os.getenv("MAX_QUERY_VARIATIONS", "2"))
     MAX_CONTEXT_CHUNKS: int = int(os.getenv("MAX_CONTEXT_CHUNKS", "2"))
     EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "50"))
@@ -43,12 +43,14 @@ class Settings(BaseSettings):
     EMBEDDINGS_DIR: str = Field(default="./data/embeddings", description="Embeddings directory")
     PROCESSED_DOCS_DIR: str = Field(default="./data/processed_docs", description="Processed documents directory")
     CACHE_DIR: str = Field(default="./data/cache", description="Cache directory")
+    DOCUMENT_CACHE_MAX_BYTES: int = Field(default=256 * 1024 * 1024, description="Memory budget, in bytes, of the in-process parsed document cache")
     
     # Performance Settings
     MAX_WORKERS: int = Field(default=4, description="Maximum worker threads")
     CHUNK_SIZE: int = Field(default=512, description="Text chunk size for processing")
     CHUNK_OVERLAP: int = Field(default=50, description="Overlap between text chunks")
     EMBEDDING_BATCH_SIZE: int = Field(default=32, description="Batch size for embedding generation")
+    LLM_CONCURRENCY: int = Field(default=3, description="Maximum questions answered concurrently per request")
     MAX_TOKENS: int = Field(default=1000000, description="Maximum tokens per day")
     SIMILARITY_THRESHOLD: float = Field(default=0.7, description="Similarity threshold for matching")
     
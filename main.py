@@ -12,11 +12,15 @@ from app.api.v1.endpoints.hackrx import router as hackrx_router
 from app.api.v1.endpoints.health import router as health_router
 from app.api.middleware.auth import AuthMiddleware
 from app.api.middleware.cors import setup_cors
-from app.api.middleware.rate_limit import RateLimitMiddleware
+from app.api.middleware.rate_limit import RateLimitMiddleware, create_rate_limit_backend
 from config.settings import get_settings
 from config.logging_config import setup_logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 # Setup logging first
 setup_logging()
@@ -48,16 +52,34 @@ app = FastAPI(
     description="Production-ready document query system using LLM and vector search",
     version="1.0.0",
     docs_url="/docs" if settings.DEBUG else None,
-    redoc_url="/redoc" if settings.DEBUG else None
+    redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse
 )
 
-# Setup CORS
-setup_cors(app)
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> ORJSONResponse:
+    """Serialize HTTP error responses with orjson."""
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None)
+    )
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> ORJSONResponse:
+    """Report request validation failures as 400 Bad Request."""
+    return ORJSONResponse(
+        status_code=400,
+        content={"detail": jsonable_encoder(exc.errors())}
+    )
 
 # Add security middleware
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
 app.add_middleware(AuthMiddleware)
-app.add_middleware(RateLimitMiddleware)
+app.add_middleware(RateLimitMiddleware, backend=create_rate_limit_backend())
+
+# Setup CORS last so it is the outermost middleware
+setup_cors(app)
 
 # Include routers
 app.include_router(hackrx_router, prefix="", tags=["hackrx"])
@@ -109,6 +131,13 @@ async def shutdown_event():
             logger.info("Cache service closed")
     except Exception as e:
         logger.warning(f"Error closing cache service: {e}")
+    
+    try:
+        from app.core.document_processor import shutdown_pdf_pool
+        shutdown_pdf_pool()
+        logger.info("PDF worker pool stopped")
+    except Exception as e:
+        logger.warning(f"Error stopping PDF worker pool: {e}")
 
 if __name__ == "__main__":
     # Railway provides PORT environment variable
@@ -2,9 +2,13 @@
 Tests for HackRX API endpoint.
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, patch
 
+from app.api.v1.endpoints.hackrx import _inflight, _request_key, _single_flight
+
 @pytest.mark.asyncio
 async def test_hackrx_endpoint_success(async_client, auth_headers, sample_questions):
     """Test successful HackRX endpoint call."""
@@ -88,3 +92,72 @@ async def test_hackrx_endpoint_processing_error(async_client, auth_headers, samp
         )
     
     assert response.status_code == 500
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_concurrent_identical_requests():
+    """Test that concurrent identical requests share one computation."""
+    calls = 0
+    release = asyncio.Event()
+    
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return ["Grace period is 30 days."]
+    
+    callers = [asyncio.ensure_future(_single_flight("key", factory)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert "key" in _inflight
+    release.set()
+    results = await asyncio.gather(*callers)
+    
+    assert calls == 1
+    assert results == [["Grace period is 30 days."]] * 3
+    assert results[0] is results[1]
+    assert "key" not in _inflight
+
+@pytest.mark.asyncio
+async def test_single_flight_failure_clears_inflight():
+    """Test that a failed computation reaches every caller and is not reused."""
+    calls = 0
+    
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("Processing failed")
+    
+    results = await asyncio.gather(
+        _single_flight("key", failing), _single_flight("key", failing), return_exceptions=True
+    )
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert "key" not in _inflight
+    
+    with pytest.raises(RuntimeError):
+        await _single_flight("key", failing)
+    assert calls == 2
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_caller_cancellation():
+    """Test that one caller disconnecting does not cancel work others await."""
+    release = asyncio.Event()
+    
+    async def factory():
+        await release.wait()
+        return ["answer"]
+    
+    first = asyncio.ensure_future(_single_flight("key", factory))
+    second = asyncio.ensure_future(_single_flight("key", factory))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    
+    assert await second == ["answer"]
+    assert first.cancelled()
+
+def test_request_key_depends_on_question_order():
+    """Test that request fingerprints distinguish question order."""
+    url = "https://example.com/test.pdf"
+    assert _request_key(url, ["a", "b"]) == _request_key(url, ["a", "b"])
+    assert _request_key(url, ["a", "b"]) != _request_key(url, ["b", "a"])
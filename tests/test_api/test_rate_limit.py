@@ -0,0 +1,86 @@
+"""
+Tests for the rate limiting middleware.
+"""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.api.middleware.rate_limit import InMemoryShardedBackend, RateLimitMiddleware
+
+async def _ok(request):
+    return PlainTextResponse("ok")
+
+def _make_app(requests_per_minute: int = 1, cors: bool = False):
+    """Build a minimal app behind the rate limiter, optionally wrapped in CORS."""
+    app = Starlette(routes=[Route("/run", _ok), Route("/health", _ok)])
+    app.add_middleware(RateLimitMiddleware, requests_per_minute=requests_per_minute)
+    if cors:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=["http://a.com", "http://b.com"],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+    return app
+
+def _client(app) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+@pytest.mark.asyncio
+async def test_sliding_window_weights_previous_window():
+    """Test that the previous window's count decays across the current window."""
+    backend = InMemoryShardedBackend(requests_per_minute=2, window_size=60)
+
+    assert await backend.hit("1.2.3.4", 0) == (False, 1)
+    assert await backend.hit("1.2.3.4", 1) == (False, 0)
+    assert (await backend.hit("1.2.3.4", 2))[0] is True
+
+    # At the start of the next window both earlier requests still count in full
+    assert (await backend.hit("1.2.3.4", 60))[0] is True
+    # Half way through, they count for one request
+    assert (await backend.hit("1.2.3.4", 90))[0] is False
+    # Other clients are tracked independently
+    assert (await backend.hit("5.6.7.8", 2))[0] is False
+
+@pytest.mark.asyncio
+async def test_rate_limit_headers_and_429():
+    """Test rate limit headers on allowed requests and the 429 response."""
+    async with _client(_make_app(requests_per_minute=1)) as client:
+        response = await client.get("/run")
+        assert response.status_code == 200
+        assert response.headers["x-ratelimit-limit"] == "1"
+        assert response.headers["x-ratelimit-remaining"] == "0"
+        assert "x-ratelimit-reset" in response.headers
+
+        response = await client.get("/run")
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "60"
+        assert response.json()["retry_after"] == 60
+
+@pytest.mark.asyncio
+async def test_health_checks_are_exempt():
+    """Test that health checks are never rate limited."""
+    async with _client(_make_app(requests_per_minute=1)) as client:
+        for _ in range(3):
+            response = await client.get("/health")
+            assert response.status_code == 200
+            assert "x-ratelimit-limit" not in response.headers
+
+@pytest.mark.asyncio
+async def test_429_headers_do_not_leak_between_responses():
+    """Test that CORS headers added to one 429 do not appear on later ones."""
+    async with _client(_make_app(requests_per_minute=1, cors=True)) as client:
+        await client.get("/run", headers={"Origin": "http://a.com"})
+        for _ in range(3):
+            response = await client.get("/run", headers={"Origin": "http://a.com"})
+            assert response.status_code == 429
+
+        response = await client.get("/run", headers={"Origin": "http://evil.com"})
+        assert response.status_code == 429
+        assert "access-control-allow-origin" not in response.headers
+        assert response.headers.get("vary", "Origin") == "Origin"
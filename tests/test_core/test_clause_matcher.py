@@ -0,0 +1,76 @@
+"""
+Tests for clause matching and scoring.
+"""
+
+import re
+from unittest.mock import patch
+
+import pytest
+
+from app.core.clause_matcher import (
+    CLAUSE_PATTERNS, CLAUSE_SCANNER, ClauseMatcher, _identify_clause_types, _query_terms,
+    _regulatory_score
+)
+
+SCAN_TEXTS = [
+    "A waiting period of 36 months continuous coverage applies to pre-existing diseases.",
+    "Waiting Period of 30 days; 24 months waiting for named ailments, two years waiting otherwise.",
+    "The rider covers a newborn. riderider newbornewborn cliniclinic",
+    "PED and AYUSH hospital treatment under plan A are covered up to 1% of SI.",
+    "What does clause seventeen say about grace period",
+]
+
+def _findall_counts(text: str):
+    """Per-type hit counts with one re.findall per pattern on the lowercased text."""
+    counts = {}
+    for clause_type, patterns in CLAUSE_PATTERNS.items():
+        found = sum(len(re.findall(pattern, text.lower())) for pattern in patterns)
+        if found:
+            counts[clause_type] = found
+    return counts
+
+@pytest.mark.parametrize("text", SCAN_TEXTS)
+def test_scanner_counts_every_pattern_separately(text):
+    """Test that overlapping patterns of one clause type each count their matches."""
+    counts = {clause_type: n for clause_type, n in CLAUSE_SCANNER.count(text).items() if n}
+    assert counts == _findall_counts(text)
+
+def test_clause_types_ranked_by_weighted_pattern_hits():
+    """Test clause type ranking for a query matched by several overlapping patterns."""
+    assert _identify_clause_types("waiting period for pre-existing diseases") == (
+        'pre_existing', 'waiting_period'
+    )
+
+def test_regulatory_score_counts_identifiers_only():
+    """Test that regulatory score counts UINs and registration codes, 0.1 each."""
+    assert _regulatory_score("Approved by the regulatory authority; licensed by government") == 0.0
+    assert _regulatory_score("UIN: HDFHLIP23024V012223, product code ab12") == pytest.approx(0.3)
+    assert _regulatory_score(" ".join(["UIN"] * 20)) == 1.0
+
+def test_keyword_density_remembered_per_query_and_text():
+    """Test that keyword density is computed once per query and chunk text."""
+    text = "A grace period of thirty days applies to premium payment, not to claims."
+    grace, waiting = _query_terms("grace period for premium"), _query_terms("waiting period")
+    expected = ClauseMatcher._compute_keyword_density(grace, text)
+    
+    first = ClauseMatcher._keyword_density(grace, text)
+    with patch.object(ClauseMatcher, '_compute_keyword_density', return_value=-1.0) as compute:
+        assert ClauseMatcher._keyword_density(grace, text) == first == expected
+        compute.assert_not_called()
+        assert ClauseMatcher._keyword_density(waiting, text) == -1.0
+
+@pytest.mark.asyncio
+async def test_low_confidence_chunk_kept_for_keyword_density():
+    """Test that a chunk below the threshold's reach still passes on keyword density."""
+    query = "What does clause seventeen say about grace period"
+    chunks = [
+        {'text': "A grace period of thirty days applies to premium payment.", 'score': 0.9, 'chunk_index': i}
+        for i in range(3)
+    ]
+    chunks.append({'text': "What does clause seventeen say", 'score': 0.61, 'chunk_index': 3})
+    
+    matches = await ClauseMatcher(None).find_relevant_clauses(query, chunks, threshold=0.6)
+    
+    match = next(match for match in matches if match.chunk_index == 3)
+    assert match.confidence < 0.6
+    assert match.keyword_density > 0.5
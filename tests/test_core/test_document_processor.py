@@ -0,0 +1,87 @@
+"""
+Tests for the document processor's parsed document cache.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.document_processor import DocumentProcessor
+
+DOCUMENT = (
+    b"Grace Period\n\n"
+    b"A grace period of thirty days is provided for premium payment after the due date. "
+    b"The policy remains in force during the grace period.\n\n"
+    b"Waiting Period\n\n"
+    b"Pre-existing diseases are covered after a waiting period of thirty-six months.\n"
+)
+
+@pytest.fixture(scope="module")
+def processor():
+    """Create one processor; each test starts from empty caches."""
+    return DocumentProcessor()
+
+@pytest.fixture(autouse=True)
+def empty_caches(processor):
+    """Clear the document cache."""
+    processor._document_cache.clear()
+    processor._document_cache_bytes = 0
+
+def _entry(text: str):
+    return ('text/plain', text, text, [text], {'hash_md5': 'x'})
+
+def test_cache_evicts_least_recently_used(processor, monkeypatch):
+    """Test that the oldest untouched document is evicted over budget."""
+    entry_bytes = processor._document_cache_entry_bytes(_entry('a' * 1000))
+    monkeypatch.setattr(processor.settings, 'DOCUMENT_CACHE_MAX_BYTES', 2 * entry_bytes)
+
+    processor._cache_document('first', _entry('a' * 1000))
+    processor._cache_document('second', _entry('b' * 1000))
+    assert processor._cached_document_result('first', 'http://test/first') is not None
+
+    processor._cache_document('third', _entry('c' * 1000))
+    assert list(processor._document_cache) == ['first', 'third']
+    assert processor._document_cache_bytes == 2 * entry_bytes
+
+def test_cache_skips_documents_over_budget(processor, monkeypatch):
+    """Test that a document larger than the whole budget is not cached."""
+    monkeypatch.setattr(processor.settings, 'DOCUMENT_CACHE_MAX_BYTES', 1000)
+
+    processor._cache_document('large', _entry('a' * 1000))
+    assert not processor._document_cache
+    assert processor._document_cache_bytes == 0
+
+def test_cache_size_counts_wide_characters(processor):
+    """Test that entries are measured in bytes, not characters."""
+    ascii_bytes = processor._document_cache_entry_bytes(_entry('a' * 1000))
+    bullet_bytes = processor._document_cache_entry_bytes(_entry('•' + 'a' * 999))
+    assert bullet_bytes > ascii_bytes + 3 * 1000
+
+@pytest.mark.asyncio
+async def test_repeated_url_reuses_parse(processor):
+    """Test that a repeated URL is downloaded again but served from the parsed cache."""
+    download = AsyncMock(return_value=DOCUMENT)
+    with patch.object(processor, '_download_document', download), \
+            patch.object(processor, '_detect_file_type', return_value='text/plain'):
+        first = await processor.process_document_from_url('http://test/policy.txt')
+        with patch.object(processor, '_analyze_document_text') as analyze:
+            second = await processor.process_document_from_url('http://test/policy.txt')
+
+    assert download.await_count == 2
+    analyze.assert_not_called()
+    assert second['document_id'] == first['document_id']
+    assert second['chunks'] == first['chunks']
+    assert second['chunks'] is not first['chunks']
+
+@pytest.mark.asyncio
+async def test_same_content_from_new_url_reuses_parse(processor):
+    """Test that identical bytes from another URL are downloaded but not re-parsed."""
+    download = AsyncMock(return_value=DOCUMENT)
+    with patch.object(processor, '_download_document', download), \
+            patch.object(processor, '_detect_file_type', return_value='text/plain'):
+        await processor.process_document_from_url('http://test/a.txt')
+        with patch.object(processor, '_analyze_document_text') as analyze:
+            result = await processor.process_document_from_url('http://test/b.txt')
+
+    assert download.await_count == 2
+    analyze.assert_not_called()
+    assert result['url'] == 'http://test/b.txt'